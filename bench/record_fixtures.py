@@ -0,0 +1,231 @@
+"""Records offline copies of the five XM pages and the six Axiory pages.
+
+    python bench/record_fixtures.py [fixtures_dir]               # needs network and Chrome
+    python bench/record_fixtures.py --synthetic [fixtures_dir]   # offline, from config/universe.json
+
+Each page is loaded live in Chrome, rendered the same way the scrapers see it,
+then saved as <fixtures_dir>/<host>/<path>.html with scripts and external
+stylesheets removed so playback never touches the network. The XM copies get a
+small stand-in for jQuery DataTables (the part of its API the engine reads), so
+the DataTables path is benchmarked rather than its DOM fallback. The Axiory copy
+embeds the tbody of all six pages plus a small pager script, so clicking the
+pager behaves like the live table.
+
+--synthetic writes the same markup and scripts with every symbol of
+config/universe.json and made-up swaps instead; the copies in bench/fixtures
+were made that way.
+"""
+import argparse
+import html
+import json
+import os
+import random
+import sys
+import time
+
+from lxml import html as lxml_html
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from swapcore import universe
+from swapcore.fixture_server import fixture_path
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+XM_PAGES = [
+    "https://www.xmtrading.com/jp/forex-trading",
+    "https://www.xmtrading.com/jp/equity-indices",
+    "https://www.xmtrading.com/jp/precious-metals",
+    "https://www.xmtrading.com/jp/energies",
+]
+CRYPTO_PAGE = "https://xem.fxsignup.com/trade/crypto-cfds.html"
+AXIORY_PAGE = "https://www.axiory.com/jp/trading-products/forex"
+
+# The DataTables calls made by spec_engine (DATATABLES_READY_JS, EXTRACT_DATATABLES_JS)
+# and record_xm, answered from the rows already in the table
+XM_DATATABLES_SHIM = """
+(function () {
+    if (window.jQuery) return;
+    function rows(table) {
+        var el = document.querySelector(table);
+        return el ? Array.prototype.slice.call(el.querySelectorAll('tbody tr')) : [];
+    }
+    function api(table) {
+        var self = {
+            rows: function () {
+                var list = rows(table);
+                return {
+                    count: function () { return list.length; },
+                    indexes: function () {
+                        return {each: function (fn) { list.forEach(function (tr, i) { fn(i); }); }};
+                    }
+                };
+            },
+            row: function (i) { return {node: function () { return rows(table)[i] || null; }}; },
+            cell: function (a, column) {
+                if (column === undefined) {
+                    return {index: function () { return {row: rows(table).indexOf(a.parentNode), column: a.cellIndex}; }};
+                }
+                return {render: function () {
+                    var tr = rows(table)[a], td = tr && tr.cells[column];
+                    return td ? td.innerHTML : null;
+                }};
+            },
+            page: {len: function () { return {draw: function () { return self; }}; }}
+        };
+        return self;
+    }
+    function $(selector) { return {DataTable: function () { return api(selector); }}; }
+    $.fn = {dataTable: {isDataTable: function (selector) { return !!document.querySelector(selector); }}};
+    window.jQuery = window.$ = $;
+})();
+"""
+
+# Swaps the table body when a pager item is clicked, like the live component
+AXIORY_PAGER_SHIM = """
+(function () {
+    var pages = %s, current = 1;
+    document.addEventListener('click', function (e) {
+        var li = e.target.closest && e.target.closest('ul.configurable-dynamic-table-pager li');
+        if (!li) return;
+        var n = parseInt(li.textContent.trim(), 10);
+        if (!n || n === current || !pages[n - 1]) return;
+        setTimeout(function () {
+            document.querySelector('tbody').innerHTML = pages[n - 1];
+            current = n;
+        }, 50);
+    }, true);
+})();
+"""
+
+def strip_page(source):
+    tree = lxml_html.fromstring(source)
+    for node in tree.xpath("//script | //noscript | //iframe | //link[@rel='stylesheet' or @rel='preload' or @rel='modulepreload']"):
+        node.getparent().remove(node)
+    return tree
+
+def add_script(tree, source):
+    script = lxml_html.Element("script")
+    script.text = source
+    tree.find("body").append(script)
+    return tree
+
+def save(tree, url, directory):
+    path = fixture_path(directory, url)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(lxml_html.tostring(tree, doctype="<!DOCTYPE html>", encoding="utf-8"))
+    print(f"Saved {url} -> {path}", flush=True)
+
+def record_xm(driver, url, directory):
+    driver.get(url)
+    WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.ID, "DataTables_Table_0")))
+    # Render every row so the copy holds the full category
+    driver.execute_script("""
+        if (window.jQuery && jQuery.fn.dataTable && jQuery.fn.dataTable.isDataTable('#DataTables_Table_0'))
+            jQuery('#DataTables_Table_0').DataTable().page.len(-1).draw(false);
+    """)
+    time.sleep(2)
+    save(add_script(strip_page(driver.page_source), XM_DATATABLES_SHIM), url, directory)
+
+def record_crypto(driver, directory):
+    driver.get(CRYPTO_PAGE)
+    WebDriverWait(driver, 30).until(
+        lambda d: "." in d.find_element(By.CSS_SELECTOR, "span[data-id$='data01']").get_attribute("textContent"))
+    time.sleep(2)
+    save(strip_page(driver.page_source), CRYPTO_PAGE, directory)
+
+def record_axiory(driver, directory):
+    driver.get(AXIORY_PAGE)
+    WebDriverWait(driver, 30).until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "tbody tr")))
+    first_page = driver.page_source
+    bodies, page = [], 1
+    while True:
+        bodies.append(driver.execute_script("return document.querySelector('tbody').innerHTML;"))
+        first = driver.execute_script("return document.querySelector('tbody tr').textContent;")
+        items = driver.find_elements(By.CSS_SELECTOR, "ul.configurable-dynamic-table-pager li")
+        target = next((li for li in items if li.get_attribute("textContent").strip() == str(page + 1)), None)
+        if target is None:
+            break
+        driver.execute_script("arguments[0].click();", target)
+        WebDriverWait(driver, 15).until(
+            lambda d: d.execute_script("return document.querySelector('tbody tr').textContent;") != first)
+        time.sleep(1)
+        page += 1
+
+    tree = add_script(strip_page(first_page), AXIORY_PAGER_SHIM % json.dumps(bodies, ensure_ascii=False))
+    save(tree, AXIORY_PAGE, directory)
+    print(f"Axiory: embedded {len(bodies)} page(s)", flush=True)
+
+def record_all(directory=FIXTURES_DIR):
+    options = Options()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+    try:
+        for url in XM_PAGES:
+            record_xm(driver, url, directory)
+        record_crypto(driver, directory)
+        record_axiory(driver, directory)
+    finally:
+        driver.quit()
+
+def _swap(rng):
+    return f"{rng.uniform(-40, 15):.2f}"
+
+def _page(body):
+    return lxml_html.fromstring(f"<html><head><meta charset='utf-8'></head><body>{body}</body></html>")
+
+def synthesize_xm(url, category, name_attr, directory):
+    rows = []
+    for sym in universe.load("XM")[1][category]:
+        rng = random.Random(f"XM {sym}")
+        rows.append(f"<tr><td data-xm-qa-name='{name_attr}'>{html.escape(sym)}</td>"
+                    f"<td data-xm-qa-name='swapLong'>{_swap(rng)}</td><td data-xm-qa-name='swapShort'>{_swap(rng)}</td></tr>")
+    options = "".join(f"<option value='{n}'>{n}</option>" for n in ("10", "25", "50", "100", "-1"))
+    body = (f"<button class='js-acceptDefaultCookie' onclick='this.remove()'>OK</button>"
+            f"<select name='DataTables_Table_0_length'>{options}</select>"
+            f"<table id='DataTables_Table_0'><thead><tr><th>Symbol</th><th>Long</th><th>Short</th></tr></thead>"
+            f"<tbody>{''.join(rows)}</tbody></table>")
+    save(add_script(_page(body), XM_DATATABLES_SHIM), url, directory)
+
+def synthesize_crypto(directory):
+    rows = ["<tr><td class='tc'>商品/銘柄</td><td>Long</td><td>Short</td></tr>"]
+    for sym in universe.load("XM")[1]["Crypto"]:
+        rng = random.Random(f"XM {sym}")
+        rows.append(f"<tr><td class='tc'>{html.escape(sym)}</td><td><span data-id='{sym}-data01'>{_swap(rng)}</span></td>"
+                    f"<td><span data-id='{sym}-data02'>{_swap(rng)}</span></td></tr>")
+    body = f"<div class='toggleBtnTable'>+</div><table class='tableCommon03'><tbody>{''.join(rows)}</tbody></table>"
+    save(_page(body), CRYPTO_PAGE, directory)
+
+def synthesize_axiory(directory, per_page=11):
+    bodies = []
+    symbols, _ = universe.load("Axiory")
+    for start in range(0, len(symbols), per_page):
+        rows = []
+        for sym in symbols[start:start + per_page]:
+            rng = random.Random(f"Axiory {sym}")
+            # Column 0 symbol, 7 short, 8 long, as on the live table
+            cells = [html.escape(sym)] + ["-"] * 6 + [_swap(rng), _swap(rng)]
+            rows.append("<tr>" + "".join(f"<td>{c}</td>" for c in cells) + "</tr>")
+        bodies.append("".join(rows))
+    pager = "".join(f"<li>{n}</li>" for n in range(1, len(bodies) + 1))
+    body = f"<table><tbody>{bodies[0]}</tbody></table><ul class='configurable-dynamic-table-pager'>{pager}</ul>"
+    save(add_script(_page(body), AXIORY_PAGER_SHIM % json.dumps(bodies, ensure_ascii=False)), AXIORY_PAGE, directory)
+
+def synthesize_all(directory=FIXTURES_DIR):
+    for url, category, name_attr in zip(XM_PAGES, ["Forex", "Indices", "Metals", "Energies"],
+                                        ["currencyPair", "symbol", "currencyPair", "symbol"]):
+        synthesize_xm(url, category, name_attr, directory)
+    synthesize_crypto(directory)
+    synthesize_axiory(directory)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("fixtures", nargs="?", default=FIXTURES_DIR)
+    parser.add_argument("--synthetic", action="store_true", help="write made-up pages without network or Chrome")
+    args = parser.parse_args()
+    (synthesize_all if args.synthetic else record_all)(args.fixtures)
@@ -0,0 +1,246 @@
+"""Offline benchmark of every extraction path against recorded pages.
+
+    python bench/record_fixtures.py           # optional: replace bench/fixtures with live copies
+    python bench/run_bench.py [--latency 0.2] [--repeat 3] [--only xm-standard] [--headed] [--json out.json]
+
+Pages are served from bench/fixtures by a local HTTP server (with the given
+artificial latency per response) and every WebDriver.get to xmtrading.com,
+fxsignup.com or axiory.com is redirected to it, so the older scripts run
+unmodified. For each path it reports wall time, WebDriver round trips, rows
+per second and the peak RSS of the Python process plus chromedriver/Chrome.
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.remote.webdriver import WebDriver
+
+from bench.record_fixtures import AXIORY_PAGE, CRYPTO_PAGE, FIXTURES_DIR, XM_PAGES
+from swapcore.fixture_server import FixtureServer
+from swapcore.brokers import AXIORY, XM
+from swapcore.http_backend import fetch_html, parse_axiory, parse_xm_crypto
+from swapcore.scripts import load_script
+from swapcore.spec_engine import DRIVER_POOL, BrokerRun
+from swapcore.specs import BrokerSpec
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+XM_ATTRS = dict(zip(XM_PAGES, ["currencyPair", "symbol", "currencyPair", "symbol"]))
+XM_CATEGORIES = dict(zip(XM_PAGES, ["Forex", "Indices", "Metals", "Energies"]))
+RECORDED_HOSTS = ("www.xmtrading.com", "xem.fxsignup.com", "www.axiory.com")
+
+# Every chromedriver command from any driver in this process
+ROUND_TRIPS = [0]
+_round_trip_lock = threading.Lock()
+
+
+def install_hooks(server, headless=True):
+    """Counts WebDriver commands, sends recorded hosts to `server`, optionally forces headless."""
+    execute, get, chrome_init = WebDriver.execute, WebDriver.get, webdriver.Chrome.__init__
+
+    def counted_execute(self, *args, **kwargs):
+        with _round_trip_lock:
+            ROUND_TRIPS[0] += 1
+        return execute(self, *args, **kwargs)
+
+    def local_get(self, url):
+        if any(f"//{host}/" in url for host in RECORDED_HOSTS):
+            url = server.local_url(url)
+        return get(self, url)
+
+    def headless_init(self, *args, options=None, **kwargs):
+        options = options or Options()
+        options.add_argument("--headless=new")
+        chrome_init(self, *args, options=options, **kwargs)
+
+    WebDriver.execute = counted_execute
+    WebDriver.get = local_get
+    if headless:
+        webdriver.Chrome.__init__ = headless_init
+
+
+class PeakRSS:
+    """Samples RSS of this process and all its children (chromedriver, Chrome) every 50ms."""
+
+    def __init__(self):
+        self.peak = 0
+        self._stop = threading.Event()
+
+    def _sample(self):
+        me = psutil.Process()
+        while not self._stop.is_set():
+            total = 0
+            for proc in [me] + me.children(recursive=True):
+                try:
+                    total += proc.memory_info().rss
+                except psutil.Error:
+                    pass
+            self.peak = max(self.peak, total)
+            self._stop.wait(0.05)
+
+    def __enter__(self):
+        if psutil:
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if not psutil:
+            # Without psutil only this process' lifetime peak is available (KiB on Linux)
+            self.peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def build_cases(server):
+    """name -> callable returning the number of rows extracted."""
+    xm = BrokerRun(XM, DRIVER_POOL)
+    axiory = BrokerRun(AXIORY, DRIVER_POOL)
+    one_go = load_script("one-go-scrape-xm.py")
+    repetition = load_script("repetition-scrape-xm.py")
+    local = server.local_url
+    xm_standard_pages = [page for page in XM.pages if page.name != "Crypto"]
+
+    def xm_standard():
+        rows = 0
+        for page in xm_standard_pages:
+            rows += len(xm.scrape_selenium(page.at(local(page.url))))
+        DRIVER_POOL.close()
+        return rows
+
+    def xm_crypto():
+        page = XM.page("Crypto")
+        rows = len(xm.scrape_selenium(page.at(local(page.url))))
+        DRIVER_POOL.close()
+        return rows
+
+    def xm_http():
+        rows = sum(len(page.http_parse(fetch_html(local(page.url)))) for page in xm_standard_pages)
+        return rows + len(parse_xm_crypto(fetch_html(local(CRYPTO_PAGE))))
+
+    def axiory_mode(mode):
+        def run():
+            axiory.extract_mode = mode
+            try:
+                return len(axiory.scrape_selenium(AXIORY.page("Forex").at(local(AXIORY_PAGE))))
+            finally:
+                DRIVER_POOL.close()
+        return run
+
+    def axiory_ordered():
+        # The whole Axiory run without the history/Sheets side effects
+        spec = BrokerSpec(AXIORY.name, [AXIORY.page("Forex").at(local(AXIORY_PAGE))], AXIORY.order,
+                          long_key=AXIORY.long_key, short_key=AXIORY.short_key, categories=AXIORY.categories)
+        run = BrokerRun(spec, DRIVER_POOL)
+        run.http_first, run.cache = False, None
+        try:
+            master_map, _ = run.run(workers=1)
+        finally:
+            DRIVER_POOL.close()
+        return len(run.ordered(master_map))
+
+    def axiory_http():
+        return len(parse_axiory(fetch_html(local(AXIORY_PAGE))))
+
+    def one_go_variant():
+        driver = webdriver.Chrome(options=Options())
+        try:
+            rows = []
+            for url in XM_PAGES:
+                rows += one_go.scrape_standard_format(driver, XM_CATEGORIES[url], url, XM_ATTRS[url])
+            rows += one_go.scrape_crypto_format(driver)
+            return len(rows)
+        finally:
+            driver.quit()
+
+    def repetition_variant():
+        rows = []
+        for url in XM_PAGES:
+            rows += repetition.scrape_standard_category(XM_CATEGORIES[url], url, XM_ATTRS[url])
+        rows += repetition.scrape_crypto_category()
+        return len(rows)
+
+    return {
+        "xm-standard": xm_standard,
+        "xm-crypto": xm_crypto,
+        "xm-http": xm_http,
+        "axiory-inpage": axiory_mode("js"),
+        "axiory-click": axiory_mode("click"),
+        "axiory-ordered": axiory_ordered,
+        "axiory-http": axiory_http,
+        "one-go": one_go_variant,
+        "repetition": repetition_variant,
+    }
+
+
+def run_case(name, fn):
+    trips_before = ROUND_TRIPS[0]
+    started = time.perf_counter()
+    error = None
+    with PeakRSS() as rss:
+        try:
+            rows = fn()
+        except Exception as e:
+            rows, error = 0, f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - started
+    return {
+        "case": name,
+        "seconds": round(seconds, 3),
+        "round_trips": ROUND_TRIPS[0] - trips_before,
+        "rows": rows,
+        "rows_per_second": round(rows / seconds, 1) if seconds else 0.0,
+        "peak_rss_mb": round(rss.peak / 2**20, 1),
+        "error": error,
+    }
+
+
+def print_table(results):
+    print(f"\n{'case':<16} {'wall s':>8} {'trips':>7} {'rows':>6} {'rows/s':>8} {'peak MB':>8}")
+    for r in results:
+        line = f"{r['case']:<16} {r['seconds']:>8.2f} {r['round_trips']:>7} {r['rows']:>6} {r['rows_per_second']:>8.1f} {r['peak_rss_mb']:>8.1f}"
+        print(line + (f"  !! {r['error']}" if r["error"] else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--only", action="append", help="run only these cases (repeatable)")
+    parser.add_argument("--headed", action="store_true", help="show the Chrome windows")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.fixtures):
+        sys.exit(f"No fixtures in {args.fixtures}; run bench/record_fixtures.py first.")
+
+    # One-off unblocked loads for the blocked-bytes estimate would land in the timings
+    os.environ.setdefault("SWAP_BLOCKING_CALIBRATE", "0")
+    results = []
+    with FixtureServer(args.fixtures, latency=args.latency) as server:
+        install_hooks(server, headless=not args.headed)
+        cases = build_cases(server)
+        for name, fn in cases.items():
+            if args.only and name not in args.only:
+                continue
+            for _ in range(args.repeat):
+                results.append(run_case(name, fn))
+                print(json.dumps(results[-1]), flush=True)
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"latency": args.latency, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
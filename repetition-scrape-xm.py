@@ -1,4 +1,3 @@
-import time
 import pandas as pd
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -6,6 +5,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
+from swapcore import readiness
 
 def get_fresh_driver():
     """Initializes a new Chrome driver instance."""
@@ -21,7 +21,7 @@ def handle_blocking_modal(driver):
             EC.element_to_be_clickable((By.CSS_SELECTOR, "button.js-acceptDefaultCookie"))
         )
         accept_button.click()
-        time.sleep(1) 
+        readiness.wait_for(driver, readiness.element_gone("button.js-acceptDefaultCookie"), timeout=5, label="cookie modal")
     except TimeoutException:
         pass
 
@@ -41,7 +41,8 @@ def scrape_standard_category(category, url, name_attr):
         try:
             length_menu = driver.find_element(By.NAME, "DataTables_Table_0_length")
             length_menu.send_keys("100")
-            time.sleep(1.5) 
+            readiness.wait_for(driver, readiness.row_count_stable("#DataTables_Table_0 tbody tr", quiet_ms=300),
+                               timeout=10, label=category)
         except: pass
 
         rows = driver.find_elements(By.CSS_SELECTOR, "#DataTables_Table_0 tbody tr")
@@ -66,19 +67,16 @@ def scrape_crypto_category():
     data = []
     try:
         driver.get(url)
-        wait = WebDriverWait(driver, 25)
         
         # Expand table
         try:
             expand_btn = driver.find_element(By.CSS_SELECTOR, "div.toggleBtnTable")
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", expand_btn)
-            time.sleep(1)
             expand_btn.click()
-            time.sleep(2)
         except: pass
 
         # Wait for numerical data
-        wait.until(lambda d: "." in d.find_element(By.CSS_SELECTOR, "span[data-id^='1INCHUSD-data']").get_attribute("textContent"))
+        readiness.wait_for(driver, readiness.numeric_text_present("span[data-id^='1INCHUSD-data']"), timeout=25, label="Crypto")
 
         rows = driver.find_elements(By.CSS_SELECTOR, "table.tableCommon03 tbody tr")
         for row in rows:
@@ -114,6 +112,8 @@ def run_consolidated_scraper():
     # Collect from crypto page
     master_data.extend(scrape_crypto_category())
 
+    print(readiness.report())
+
     # --- FINAL RENDER ---
     df = pd.DataFrame(master_data)
     print("\n" + "="*60)
@@ -0,0 +1,77 @@
+import os
+import sys
+from datetime import datetime
+
+from swapcore import compare
+from swapcore.brokers import BROKERS
+from swapcore.engine import run_all
+from swapcore.metrics import METRICS
+from swapcore.sheets_writer import SheetsWriter
+from swapcore.spec_engine import DRIVER_POOL, BrokerRun
+
+# Pages fetched at the same time from one host (xmtrading.com serves four of them)
+PER_HOST = int(os.environ.get("SWAP_PER_HOST", "4"))
+
+# Seconds before a page is given up on
+PAGE_TIMEOUT = int(os.environ.get("SWAP_PAGE_TIMEOUT", "180"))
+
+# Spreadsheet for the cross-broker tab (default: the first broker's spreadsheet)
+COMPARE_SPREADSHEET = os.environ.get("SWAP_COMPARE_SPREADSHEET")
+
+def compare_brokers(runs):
+    """Joins the published runs on their symbol key and writes the comparison as one tab."""
+    runs = [run for run in runs if run.frame is not None]
+    if len(runs) < 2:
+        return None
+    index = compare.SymbolIndex()
+    for run in runs:
+        index.add_frame(run.spec.name, run.frame, run.spec.long_key, run.spec.short_key)
+    header, rows = compare.compare(index)
+    print(f"\n--- {' vs '.join(index.brokers)}: {len(rows)} shared symbol(s) ---", flush=True)
+
+    sheet_run = next((run for run in runs if run.spec.sheet is not None), None)
+    if sheet_run is None:
+        return header, rows
+    sheet = sheet_run.spec.sheet
+    writer = sheet_run.writer
+    if COMPARE_SPREADSHEET and COMPARE_SPREADSHEET != sheet.spreadsheet:
+        writer = SheetsWriter(sheet.keyfile, COMPARE_SPREADSHEET)
+    title = f"{' vs '.join(index.brokers)} {datetime.now().strftime('%m/%d/%Y')}"
+    try:
+        # Tab creation, values and formatting in one batchUpdate, like the broker tabs
+        result = writer.write_tab(title, header, rows, sheet.text_format, min_rows=len(rows) + 1, cols=len(header))
+        print(f"Sheets: '{title}' {result}, {writer.changed_cells} cells", flush=True)
+    except Exception as e:
+        print(f"Error writing the comparison tab: {e}", flush=True)
+    return header, rows
+
+def run_all_brokers(names=None):
+    """Scrapes every page of every broker (or just `names`) on one event loop, then publishes each broker."""
+    runs = [BrokerRun(BROKERS[name], DRIVER_POOL) for name in (names or BROKERS)]
+    by_name = {run.spec.name: run for run in runs}
+    runners = {run.spec.name: run.open_sinks() for run in runs}
+
+    def page_done(result):
+        # Streaming sinks get each page as it finishes, whichever broker it belongs to
+        if result.ok:
+            by_name[result.task.broker].page_done(runners[result.task.broker], result.task.name, result.rows)
+
+    try:
+        results = run_all([task for run in runs for task in run.tasks(PAGE_TIMEOUT)], per_host=PER_HOST,
+                          on_result=page_done)
+    finally:
+        DRIVER_POOL.close()
+    print(DRIVER_POOL.report(), flush=True)
+
+    for run in runs:
+        # Results come back in task order, so each broker's pages stay in spec order
+        print(f"\n=== {run.spec.name.upper()} ===")
+        pages = [result.rows for result in results if result.task.broker == run.spec.name]
+        master_map, categories = run.merge(pages)
+        run.publish(master_map, categories, unchanged=run.all_unchanged, runner=runners[run.spec.name])
+    compare_brokers(runs)
+    print(f"Phase timings written for {len(METRICS.flush())} phase(s)", flush=True)
+
+if __name__ == "__main__":
+    # python scrape-all.py [XM] [Axiory]
+    run_all_brokers(sys.argv[1:] or None)
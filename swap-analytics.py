@@ -0,0 +1,66 @@
+"""Day-over-day deltas, unusual moves and carry rankings from the swap history.
+
+    python swap-analytics.py XM [--days 365] [--window 7] [--top 10] [--z 3] [--csv analytics] [--sheets]
+"""
+import argparse
+import os
+import time
+from datetime import date, timedelta
+
+import pandas as pd
+
+from swapcore import analytics
+from swapcore.brokers import BROKERS
+from swapcore.sheets_writer import SheetsWriter
+
+
+def run(broker, days=365, window=7, top=10, z=3.0, csv_dir=None, sheets=False):
+    started = time.perf_counter()
+    start = (date.today() - timedelta(days=days)).isoformat()
+    matrix = analytics.SwapMatrix.load(broker, start=start)
+    if not len(matrix.dates):
+        print(f"No {broker} history since {start}.", flush=True)
+        return None, None
+    summary, ranking = analytics.summarize(matrix, window=window, top=top, z_threshold=z)
+    elapsed = time.perf_counter() - started
+    print(f"{broker}: {len(matrix.symbols)} symbols x {len(matrix.dates)} days "
+          f"({matrix.dates[0]} .. {matrix.dates[-1]}) analysed in {elapsed:.3f}s", flush=True)
+
+    latest = matrix.dates[-1]
+    unusual = summary[summary["Unusual"]]
+    print(f"\n--- Unusual moves on {latest} (|z| >= {z:g} against the previous {window} days) ---")
+    print(unusual.to_string(index=False) if not unusual.empty else "none")
+    print(f"\n--- Top {top} carry on {latest} ---")
+    print(ranking.to_string(index=False))
+
+    if csv_dir:
+        os.makedirs(csv_dir, exist_ok=True)
+        for kind, df in (("summary", summary), ("carry", ranking)):
+            path = os.path.join(csv_dir, f"{broker.lower()}-{latest}-{kind}.csv")
+            df.to_csv(path, index=False, encoding="utf-8-sig")
+            print(f"Wrote {path}", flush=True)
+
+    if sheets:
+        sheet = BROKERS[broker].sheet
+        writer = SheetsWriter(sheet.keyfile, sheet.spreadsheet)
+        # Summary and carry ranking side by side in one tab, separated by an empty column
+        gap = pd.DataFrame({"": [None] * max(len(summary), len(ranking))})
+        combined = pd.concat([summary, gap, ranking], axis=1)
+        header = list(summary.columns) + [""] + list(ranking.columns)
+        title = f"Analytics {date.fromisoformat(latest).strftime('%m/%d/%Y')}"
+        result = writer.write_tab(title, header, analytics.sheet_rows(combined), sheet.text_format,
+                                  min_rows=len(combined) + 1, cols=len(header))
+        print(f"Sheets: '{title}' {result}, {writer.changed_cells} cells in {writer.api_calls} API call(s)", flush=True)
+    return summary, ranking
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("broker", choices=sorted(BROKERS))
+    parser.add_argument("--days", type=int, default=365, help="history to load")
+    parser.add_argument("--window", type=int, default=7, help="days in the rolling mean and z-score baseline")
+    parser.add_argument("--top", type=int, default=10, help="symbols in the carry ranking")
+    parser.add_argument("--z", type=float, default=3.0, help="|z| that counts as an unusual move")
+    parser.add_argument("--csv", metavar="DIR", help="write <broker>-<date>-summary.csv and -carry.csv here")
+    parser.add_argument("--sheets", action="store_true", help="write an 'Analytics <date>' tab to the broker's spreadsheet")
+    args = parser.parse_args()
+    run(args.broker, args.days, args.window, args.top, args.z, args.csv, args.sheets)
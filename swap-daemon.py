@@ -0,0 +1,41 @@
+import signal
+import sys
+
+from swapcore.brokers import BROKERS
+from swapcore.scheduler import Daemon, Schedule
+from swapcore.spec_engine import DRIVER_POOL, BrokerRun
+
+# Per broker (then SWAP_* for all): <BROKER>_ROLLOVER (HH:MM local time, default 06:00),
+# <BROKER>_ROLLOVER_WINDOW and <BROKER>_NEAR_INTERVAL (minutes, default 60 and 10),
+# <BROKER>_INTERVAL (minutes between runs the rest of the day, default 60).
+
+def schedule_for(spec):
+    return Schedule(
+        rollover=spec.setting("ROLLOVER", "06:00"),
+        window=int(spec.setting("ROLLOVER_WINDOW", "60")),
+        near=int(spec.setting("NEAR_INTERVAL", "10")),
+        interval=int(spec.setting("INTERVAL", "60")),
+    )
+
+def main(names=None):
+    # One BrokerRun per broker for the life of the process: the pooled Chrome sessions
+    # and the authorized Sheets client stay warm between runs
+    runs = [BrokerRun(BROKERS[name], DRIVER_POOL) for name in (names or BROKERS)]
+    daemon = Daemon({run.spec.name: (run.cycle, schedule_for(run.spec)) for run in runs})
+
+    def shutdown(signum, frame):
+        print("Stopping after the runs in progress...", flush=True)
+        daemon.stop()
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    try:
+        daemon.serve()
+    finally:
+        DRIVER_POOL.close()
+        for name, stats in daemon.stats.items():
+            print(f"{name}: {stats['runs']} run(s), {stats['failures']} failed, {stats['skipped']} skipped", flush=True)
+
+if __name__ == "__main__":
+    # python swap-daemon.py [XM] [Axiory]
+    main(sys.argv[1:] or None)
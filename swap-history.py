@@ -0,0 +1,20 @@
+import sys
+from datetime import date, timedelta
+import pandas as pd
+from swapcore import history
+
+def show_history(broker, symbol, days=365):
+    start = (date.today() - timedelta(days=days)).isoformat()
+    rows = history.query(broker, symbol=symbol, start=start)
+    df = pd.DataFrame(rows, columns=["Date", "Scraped At", "Symbol", "Category", "Long", "Short"])
+    if df.empty:
+        print(f"No {broker} history for {symbol} since {start}.")
+    else:
+        print(df.to_string(index=False))
+
+if __name__ == "__main__":
+    # python swap-history.py xm GBPJPY [days]
+    if len(sys.argv) < 3:
+        print("usage: python swap-history.py <broker> <symbol> [days]")
+        sys.exit(1)
+    show_history(sys.argv[1], sys.argv[2], int(sys.argv[3]) if len(sys.argv) > 3 else 365)
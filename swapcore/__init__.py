@@ -0,0 +1 @@
+# Shared building blocks for the XM and Axiory scrapers.
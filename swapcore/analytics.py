@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+from swapcore import history
+
+
+class SwapMatrix:
+    """Dense symbol x date arrays of the last long/short value scraped each day (NaN = no value)."""
+
+    def __init__(self, symbols, dates, long, short):
+        self.symbols = symbols
+        self.dates = dates
+        self.long = long
+        self.short = short
+
+    @classmethod
+    def load(cls, broker, start=None, end=None, history_dir=None):
+        # Only each symbol's last value of the day leaves SQLite; the daemon stores 20-30 runs a day
+        rows = history.last_per_day(broker, start=start, end=end, history_dir=history_dir)
+        df = pd.DataFrame(rows, columns=["date", "symbol", "long", "short"])
+        symbols, sym_idx = np.unique(df["symbol"].to_numpy(dtype=str), return_inverse=True)
+        dates, date_idx = np.unique(df["date"].to_numpy(dtype=str), return_inverse=True)
+        long = np.full((len(symbols), len(dates)), np.nan)
+        short = np.full((len(symbols), len(dates)), np.nan)
+        long[sym_idx, date_idx] = df["long"].to_numpy(dtype="float64")
+        short[sym_idx, date_idx] = df["short"].to_numpy(dtype="float64")
+        return cls(symbols, dates, long, short)
+
+
+def deltas(values):
+    """Day-over-day change; the first day is NaN."""
+    out = np.full_like(values, np.nan)
+    out[:, 1:] = values[:, 1:] - values[:, :-1]
+    return out
+
+def rolling_mean(values, window, shift=0):
+    """Mean of the last `window` days (NaNs skipped) ending `shift` days before each day."""
+    present = ~np.isnan(values)
+    sums = np.concatenate([np.zeros((len(values), 1)), np.cumsum(np.where(present, values, 0.0), axis=1)], axis=1)
+    counts = np.concatenate([np.zeros((len(values), 1)), np.cumsum(present, axis=1)], axis=1)
+    n = values.shape[1]
+    stop = np.arange(1, n + 1) - shift
+    begin = np.clip(stop - window, 0, None)
+    stop = np.clip(stop, 0, None)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (sums[:, stop] - sums[:, begin]) / (counts[:, stop] - counts[:, begin])
+
+def zscores(values, window, eps=1e-9):
+    """How unusual each day's move is against the `window` moves before it.
+
+    A swap that sat still for the whole window has no spread: any move after
+    that is +/-inf (always unusual), no move is 0. NaN where there is no move
+    or no history to compare with.
+    """
+    moves = deltas(values)
+    mean = rolling_mean(moves, window, shift=1)
+    spread = np.sqrt(np.clip(rolling_mean(moves ** 2, window, shift=1) - mean ** 2, 0, None))
+    surprise = moves - mean
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = surprise / spread
+        flat = spread < eps
+        z[flat] = np.where(np.abs(surprise[flat]) < eps, 0.0, np.sign(surprise[flat]) * np.inf)
+    z[np.isnan(surprise)] = np.nan
+    return z
+
+def top_carry(symbols, latest, n):
+    """[(symbol, value), ...] for the `n` highest values, NaNs last and dropped."""
+    order = np.argsort(np.where(np.isnan(latest), -np.inf, latest))[::-1][:n]
+    return [(symbols[i], float(latest[i])) for i in order if not np.isnan(latest[i])]
+
+
+def summarize(matrix, window=7, top=10, z_threshold=3.0):
+    """(per-symbol summary DataFrame for the latest day, carry ranking DataFrame)."""
+    if not len(matrix.dates):
+        return pd.DataFrame(), pd.DataFrame()
+    columns = {"Symbol": matrix.symbols}
+    for side, values in (("Long", matrix.long), ("Short", matrix.short)):
+        columns[side] = values[:, -1]
+        columns[f"{side} Δ"] = deltas(values)[:, -1]
+        columns[f"{side} {window}d mean"] = rolling_mean(values, window)[:, -1]
+        columns[f"{side} z"] = zscores(values, window)[:, -1]
+    summary = pd.DataFrame(columns)
+    summary["Unusual"] = (summary[["Long z", "Short z"]].abs() >= z_threshold).any(axis=1)
+    summary = summary.sort_values(["Unusual", "Symbol"], ascending=[False, True], ignore_index=True)
+
+    best_long = top_carry(matrix.symbols, matrix.long[:, -1], top)
+    best_short = top_carry(matrix.symbols, matrix.short[:, -1], top)
+    # Fewer numeric values than `top` (a mostly failed run, --top 100 on 61 symbols) leaves the tail empty
+    ranking = pd.DataFrame({
+        "Rank": np.arange(1, max(len(best_long), len(best_short)) + 1),
+        "Long Symbol": pd.Series([s for s, _ in best_long], dtype=object),
+        "Long Carry": pd.Series([v for _, v in best_long], dtype="float64"),
+        "Short Symbol": pd.Series([s for s, _ in best_short], dtype=object),
+        "Short Carry": pd.Series([v for _, v in best_short], dtype="float64"),
+    })
+    return summary, ranking
+
+def sheet_rows(df, digits=4):
+    """Rows of `df` for upload: floats rounded, NaN as empty cells, flags as text."""
+    out = df.astype(object)
+    # By position: a frame put together with pd.concat may repeat a column name
+    for i in range(df.shape[1]):
+        col = df.iloc[:, i]
+        if col.dtype == "float64":
+            numbers = col.to_numpy()
+            values = col.round(digits).to_numpy().astype(object)
+            values[np.isnan(numbers)] = None
+            # Sheets takes no infinities; z-scores of a move out of a flat window are +/-inf
+            values[np.isposinf(numbers)] = "+inf"
+            values[np.isneginf(numbers)] = "-inf"
+            out.iloc[:, i] = values
+        elif col.dtype == bool:
+            out.iloc[:, i] = np.where(col.to_numpy(), "YES", "")
+        else:
+            # Text columns padded by pd.concat hold NaN
+            values = col.to_numpy(dtype=object, copy=True)
+            values[pd.isna(values)] = None
+            out.iloc[:, i] = values
+    return out.values.tolist()
@@ -0,0 +1,170 @@
+import json
+import os
+import threading
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+
+# Never needed to read a swap table
+COMMON = [
+    # fonts, images, media
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.webp", "*.ico", "*.mp4", "*.webm",
+    "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    # analytics, tag managers, ads
+    "*googletagmanager.com*", "*google-analytics.com*", "*analytics.google.com*", "*doubleclick.net*",
+    "*googlesyndication.com*", "*googleadservices.com*", "*connect.facebook.net*", "*facebook.com/tr*",
+    "*hotjar.com*", "*clarity.ms*", "*bat.bing.com*", "*ads-twitter.com*", "*analytics.tiktok.com*",
+    "*snap.licdn.com*", "*yimg.jp*", "*yahoo.co.jp*", "*criteo.*", "*adnxs.com*", "*taboola.com*",
+    # chat widgets
+    "*livechatinc.com*", "*intercom.io*", "*intercomcdn.com*", "*zopim.com*", "*zdassets.com*", "*tawk.to*",
+]
+
+# Domain -> URL patterns for Network.setBlockedURLs ("*" is the only wildcard).
+# Stylesheets go too: every table is read from the DOM or by script, never by layout.
+PRESETS = {
+    "xmtrading.com": COMMON + ["*.css", "*.css?*"],
+    "fxsignup.com": COMMON + ["*.css", "*.css?*"],
+    "axiory.com": COMMON + ["*.css", "*.css?*"],
+}
+
+# Sizes of resources seen while they were not blocked, used to estimate the bytes a
+# blocked request would have cost (a blocked request never reports a size). Keyed by
+# URL without its query string (cache busters would add a key per load) and capped
+# at SIZES_MAX entries, the least recently seen dropped first. Each page gets one
+# unblocked calibration load to fill them in, repeated after CALIBRATE_DAYS.
+SIZES_PATH = os.environ.get("SWAP_RESOURCE_SIZES", ".swap_cache/resource-sizes.json")
+SIZES_MAX = int(os.environ.get("SWAP_RESOURCE_SIZES_MAX", "2000"))
+CALIBRATE_DAYS = int(os.environ.get("SWAP_RESOURCE_CALIBRATE_DAYS", "30"))
+_sizes = None
+_calibrated = None  # page size_key -> ISO date of its last calibration load
+_sizes_lock = threading.Lock()
+
+
+def patterns_for(url, block=(), allow=()):
+    """The preset of `url`'s domain plus `block`, minus any pattern listed in `allow`."""
+    host = urlsplit(url).netloc
+    preset = next((p for domain, p in PRESETS.items() if host == domain or host.endswith("." + domain)), [])
+    return [p for p in list(preset) + list(block) if p not in set(allow)]
+
+def size_key(url):
+    """`url` without its query string and fragment."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}"
+
+def apply(driver, patterns):
+    """Blocks `patterns` for every later request of this driver (empty list unblocks)."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+def _load_sizes():
+    global _sizes, _calibrated
+    if _sizes is None:
+        try:
+            with open(SIZES_PATH, encoding="utf-8") as f:
+                data = json.load(f)
+            if "sizes" not in data:
+                # Older files: a flat {url: size}, keyed by the full URL before the cap
+                data = {"sizes": data}
+            _sizes = {size_key(url): size for url, size in data["sizes"].items()}
+            _calibrated = dict(data.get("calibrated", {}))
+        except (OSError, ValueError, AttributeError, TypeError):
+            _sizes, _calibrated = {}, {}
+        _sizes = dict(list(_sizes.items())[-SIZES_MAX:])
+    return _sizes
+
+def needs_calibration(url):
+    """True when `url` has had no unblocked calibration load in the last CALIBRATE_DAYS."""
+    with _sizes_lock:
+        _load_sizes()
+        last = _calibrated.get(size_key(url))
+    return last is None or last < (date.today() - timedelta(days=CALIBRATE_DAYS)).isoformat()
+
+def calibrated(url):
+    with _sizes_lock:
+        _load_sizes()
+        _calibrated[size_key(url)] = date.today().isoformat()
+
+def save_sizes():
+    with _sizes_lock:
+        if not _sizes and not _calibrated:
+            return
+        os.makedirs(os.path.dirname(SIZES_PATH) or ".", exist_ok=True)
+        tmp = SIZES_PATH + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"sizes": _sizes, "calibrated": _calibrated}, f)
+        os.replace(tmp, SIZES_PATH)
+
+
+class NetworkStats:
+    """Requests and bytes of the pages loaded by a driver, read from its performance log.
+
+    Needs the driver started with goog:loggingPrefs {"performance": "ALL"} (see
+    spec_engine.new_chrome). `blocked_bytes` is an estimate from sizes recorded when
+    the same URL was last loaded unblocked; `blocked_unknown` counts the rest.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.transferred = 0
+        self.blocked = 0
+        self.blocked_bytes = 0
+        self.blocked_unknown = 0
+        self.blocked_types = {}
+
+    def add(self, other):
+        self.requests += other.requests
+        self.transferred += other.transferred
+        self.blocked += other.blocked
+        self.blocked_bytes += other.blocked_bytes
+        self.blocked_unknown += other.blocked_unknown
+        for kind, n in other.blocked_types.items():
+            self.blocked_types[kind] = self.blocked_types.get(kind, 0) + n
+
+    def read(self, entries):
+        urls = {}
+        with _sizes_lock:
+            sizes = _load_sizes()
+            for entry in entries:
+                try:
+                    message = json.loads(entry["message"])["message"]
+                except (KeyError, TypeError, ValueError):
+                    continue
+                method, params = message.get("method"), message.get("params", {})
+                if method == "Network.requestWillBeSent":
+                    self.requests += 1
+                    urls[params.get("requestId")] = params.get("request", {}).get("url", "")
+                elif method == "Network.loadingFinished":
+                    self.transferred += int(params.get("encodedDataLength") or 0)
+                    url = urls.get(params.get("requestId"))
+                    if url:
+                        key = size_key(url)
+                        sizes.pop(key, None)
+                        sizes[key] = int(params.get("encodedDataLength") or 0)
+                        while len(sizes) > SIZES_MAX:
+                            del sizes[next(iter(sizes))]
+                elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                    self.blocked += 1
+                    kind = params.get("type", "Other")
+                    self.blocked_types[kind] = self.blocked_types.get(kind, 0) + 1
+                    url = urls.get(params.get("requestId"))
+                    size = sizes.get(size_key(url)) if url else None
+                    if size is None:
+                        self.blocked_unknown += 1
+                    else:
+                        self.blocked_bytes += size
+        return self
+
+    @classmethod
+    def collect(cls, driver):
+        """Stats for everything logged since the last collect (the log is drained)."""
+        try:
+            return cls().read(driver.get_log("performance"))
+        except Exception:
+            return cls()
+
+    def report(self):
+        kinds = ", ".join(f"{k}={n}" for k, n in sorted(self.blocked_types.items())) or "none"
+        unknown = f", {self.blocked_unknown} of unknown size" if self.blocked_unknown else ""
+        return (f"Network: {self.requests} request(s), {self.transferred / 1024:.0f} KiB transferred; "
+                f"blocked {self.blocked} request(s), est. ~{self.blocked_bytes / 1024:.0f} KiB saved "
+                f"(sizes from unblocked calibration loads{unknown}) [{kinds}]")
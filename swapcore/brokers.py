@@ -0,0 +1,76 @@
+from functools import partial
+
+from swapcore import readiness
+from swapcore.http_backend import parse_axiory, parse_xm_crypto, parse_xm_standard
+from swapcore.sheets_writer import DARK_GREY
+from swapcore.specs import BrokerSpec, DataTablesPaging, PageSpec, PagerPaging, SheetSpec
+
+# Adding a broker means adding a BrokerSpec here and to BROKERS, plus its symbols in
+# config/universe.json (output order and the symbols expected on each page).
+# No page has a JsonCapture yet: add one (PageSpec capture=...) only with the keys
+# of a payload recorded from the live page
+
+
+def _xm_standard(name, url, name_attr):
+    return PageSpec(
+        name, url,
+        rows="#DataTables_Table_0 tbody tr",
+        symbol=f"td[data-xm-qa-name='{name_attr}']",
+        long="td[data-xm-qa-name='swapLong']",
+        short="td[data-xm-qa-name='swapShort']",
+        modal="button.js-acceptDefaultCookie",
+        ready=readiness.element_present("#DataTables_Table_0"),
+        paging=DataTablesPaging("#DataTables_Table_0", length_menu="select[name='DataTables_Table_0_length']"),
+        http_parse=partial(parse_xm_standard, name_attr=name_attr),
+    )
+
+
+XM = BrokerSpec(
+    "XM",
+    pages=[
+        _xm_standard("Forex", "https://www.xmtrading.com/jp/forex-trading", "currencyPair"),
+        _xm_standard("Indices", "https://www.xmtrading.com/jp/equity-indices", "symbol"),
+        _xm_standard("Metals", "https://www.xmtrading.com/jp/precious-metals", "currencyPair"),
+        _xm_standard("Energies", "https://www.xmtrading.com/jp/energies", "symbol"),
+        # Extremely dynamic page: swaps are filled in by script after the toggle
+        PageSpec(
+            "Crypto", "https://xem.fxsignup.com/trade/crypto-cfds.html",
+            rows="table.tableCommon03 tbody tr",
+            symbol="td.tc",
+            long="span[data-id$='data01']",
+            short="span[data-id$='data02']",
+            strategy="eager",
+            expand="div.toggleBtnTable",
+            ready=readiness.numeric_text_present("span[data-id$='data01']"),
+            skip=["商品/銘柄"],
+            http_parse=parse_xm_crypto,
+            timeout=25,
+        ),
+    ],
+    sheet=SheetSpec(
+        "xm/service_account.json", "[DYNAMIC] XM SWAP POINTS",
+        header=["Symbol", "ロング (Long)", "ショート (Short)"], columns=["Long", "Short"],
+        text_format={"fontFamily": "Roboto", "fontSize": 10, "foregroundColor": DARK_GREY}, min_rows=200,
+    ),
+)
+
+AXIORY = BrokerSpec(
+    "Axiory",
+    pages=[
+        # Column 0 symbol, 7 short, 8 long; six pages behind the pager
+        PageSpec(
+            "Forex", "https://www.axiory.com/jp/trading-products/forex",
+            rows="tbody tr", symbol=0, long=8, short=7,
+            paging=PagerPaging("ul.configurable-dynamic-table-pager li"),
+            http_parse=parse_axiory,
+        ),
+    ],
+    sheet=SheetSpec(
+        "axiory/service_account.json", "[DYNAMIC] AXIORY SWAP POINTS",
+        header=["Symbol", "Swap Short", "Swap Long"], columns=["Swap Short", "Swap Long"],
+        text_format={"fontFamily": "Noto Sans JP", "fontSize": 9, "foregroundColor": DARK_GREY}, min_rows=150,
+    ),
+    long_key="Swap Long", short_key="Swap Short",
+)
+
+BROKERS = {spec.name: spec for spec in (XM, AXIORY)}
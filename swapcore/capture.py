@@ -0,0 +1,121 @@
+import base64
+import json
+import re
+
+SYMBOL_RE = re.compile(r"^[A-Za-z0-9.#_/\-]{2,20}$")
+NUMBER_RE = re.compile(r"^[+\-−]?\d[\d,]*(\.\d+)?$")
+
+
+class JsonCapture:
+    """Read a page's rows from the JSON its scripts fetch instead of from the DOM.
+
+    Only XHR/fetch responses whose URL contains `url_contains` (any, if None) are
+    looked at. `symbol`, `long` and `short` are the record keys, or the positions
+    for array records, as seen in a real payload of the page: nothing is guessed,
+    so a quotes feed with buy/sell prices can't pass for swaps. Responses are
+    watched for `timeout` seconds after the page loads.
+    """
+
+    def __init__(self, symbol, long, short, url_contains=None, timeout=5):
+        keys = (symbol, long, short)
+        if not (all(isinstance(k, str) for k in keys) or all(isinstance(k, int) for k in keys)):
+            raise ValueError("JsonCapture needs three record keys or three array positions")
+        self.url_contains = url_contains
+        self.timeout = timeout
+        self.symbol = symbol
+        self.long = long
+        self.short = short
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        # {"value": -1.2, ...} style cells
+        value = next((value[k] for k in ("value", "text", "display") if k in value), "")
+    return str(value).strip()
+
+def _lists(obj, depth=0):
+    """Every list in the payload that holds records (dicts or lists)."""
+    if depth > 6:
+        return
+    if isinstance(obj, list):
+        if obj and all(isinstance(item, (dict, list)) for item in obj):
+            yield obj
+        for item in obj[:50]:
+            yield from _lists(item, depth + 1)
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            yield from _lists(value, depth + 1)
+
+def _map_list(records, capture):
+    keys = (capture.symbol, capture.long, capture.short)
+    first = records[0]
+    if isinstance(first, dict) and isinstance(capture.symbol, str):
+        if not all(k in first for k in keys):
+            return []
+        get = lambda rec, k: rec.get(k) if isinstance(rec, dict) else None
+    elif isinstance(first, list) and isinstance(capture.symbol, int):
+        # Array rows (e.g. DataTables ajax "data")
+        get = lambda rec, i: rec[i] if isinstance(rec, list) and len(rec) > i else None
+    else:
+        return []
+    sym, long, short = keys
+    return [[_text(get(rec, sym)), _text(get(rec, long)), _text(get(rec, short))] for rec in records]
+
+def plausible(rows):
+    """At least 90% of rows look like a symbol with two numeric swaps."""
+    if not rows:
+        return False
+    good = sum(1 for sym, l, s in rows
+               if SYMBOL_RE.match(sym) and NUMBER_RE.match(l.replace(" ", "")) and NUMBER_RE.match(s.replace(" ", "")))
+    return good >= 0.9 * len(rows)
+
+def rows_from_payload(payload, capture):
+    """[[symbol, long, short], ...] from the longest record list in a JSON payload
+    that has the capture's exact keys (or positions). Returns [] unless the
+    result passes plausible().
+    """
+    best = []
+    for records in _lists(payload):
+        rows = [r for r in _map_list(records, capture) if r[0]]
+        if len(rows) > len(best) and plausible(rows):
+            best = rows
+    return best
+
+
+class ResponseWatcher:
+    """Follows a driver's performance log and yields finished XHR/fetch JSON responses."""
+
+    def __init__(self, url_contains=None):
+        self.url_contains = url_contains
+        self.responses = {}  # requestId -> url
+        self.seen = set()
+
+    def feed(self, entries):
+        """Request ids (with their URL) whose JSON body is complete, from these log entries."""
+        finished = []
+        for entry in entries:
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, TypeError, ValueError):
+                continue
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.responseReceived" and params.get("type") in ("XHR", "Fetch"):
+                response = params.get("response", {})
+                url = response.get("url", "")
+                if "json" in response.get("mimeType", "") and (not self.url_contains or self.url_contains in url):
+                    self.responses[params["requestId"]] = url
+            elif method == "Network.loadingFinished":
+                rid = params.get("requestId")
+                if rid in self.responses and rid not in self.seen:
+                    self.seen.add(rid)
+                    finished.append((rid, self.responses[rid]))
+        return finished
+
+def response_json(driver, request_id):
+    body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": request_id})
+    text = body.get("body", "")
+    if body.get("base64Encoded"):
+        text = base64.b64decode(text).decode("utf-8", "replace")
+    return json.loads(text)
@@ -0,0 +1,103 @@
+import re
+
+import numpy as np
+
+from swapcore import universe
+
+
+def symbol_key(symbol, aliases=None):
+    """Join key for a symbol across brokers: alias applied, upper case, separators dropped."""
+    symbol = (aliases or {}).get(symbol, symbol)
+    return re.sub(r"[^A-Z0-9]", "", str(symbol).upper())
+
+
+class SymbolIndex:
+    """Normalized symbol key -> row number, with one (long, short) column pair per broker.
+
+    Each broker is added in one pass over its rows, so joining N brokers stays
+    linear in the number of rows. Keys get row numbers in first-seen order.
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.symbols = []
+        self.brokers = []
+        self._columns = {}  # broker -> (rows, longs, shorts)
+
+    def add(self, broker, symbols, longs, shorts, aliases=None):
+        """Adds a broker's symbols with their float long/short swaps (NaN = no value)."""
+        if aliases is None:
+            try:
+                aliases = universe.aliases(broker)
+            except KeyError:
+                aliases = {}
+        rows, seen = [], set()
+        for sym in symbols:
+            key = symbol_key(sym, aliases)
+            if key in seen:
+                print(f"{broker}: {sym} has the same comparison key as an earlier symbol, ignoring it", flush=True)
+                rows.append(-1)
+                continue
+            seen.add(key)
+            if key not in self.keys:
+                self.keys[key] = len(self.symbols)
+                self.symbols.append(sym)
+            rows.append(self.keys[key])
+        self.brokers.append(broker)
+        self._columns[broker] = (np.array(rows, dtype=int), np.asarray(longs, dtype="float64"),
+                                 np.asarray(shorts, dtype="float64"))
+
+    def add_frame(self, broker, frame, long_key, short_key, aliases=None):
+        """Adds a normalized publish frame (see normalize.normalize_frame)."""
+        self.add(broker, frame["Symbol"].tolist(), frame[long_key].to_numpy(), frame[short_key].to_numpy(), aliases)
+
+    def matrix(self, side):
+        """symbols x brokers float64 array of the long (side=0) or short (side=1) swaps."""
+        out = np.full((len(self.symbols), len(self.brokers)), np.nan)
+        for col, broker in enumerate(self.brokers):
+            rows, longs, shorts = self._columns[broker]
+            keep = rows >= 0
+            out[rows[keep], col] = (longs, shorts)[side][keep]
+        return out
+
+
+def _best(values, brokers):
+    """(best broker per row, margin over the runner-up) for rows quoted by 2+ brokers."""
+    filled = np.where(np.isnan(values), -np.inf, values)
+    order = np.argsort(-filled, axis=1, kind="stable")
+    rows = np.arange(len(values))
+    first, second = filled[rows, order[:, 0]], filled[rows, order[:, 1]]
+    quoted = np.isfinite(second)
+    names = np.where(quoted, np.array(brokers, dtype=object)[order[:, 0]], None)
+    with np.errstate(invalid="ignore"):
+        margin = np.where(quoted, first - second, np.nan)
+    return names, margin
+
+def compare(index):
+    """(header, rows) for every symbol quoted by at least two brokers.
+
+    Rows carry each broker's long and short swap, then for each side the broker
+    that pays more (a higher swap is a larger credit or a smaller charge) and
+    by how much it beats the next best broker.
+    """
+    if len(index.brokers) < 2:
+        raise ValueError("comparing needs at least two brokers")
+    longs, shorts = index.matrix(0), index.matrix(1)
+    quoted = (~np.isnan(longs) | ~np.isnan(shorts)).sum(axis=1) >= 2
+    best_long, long_margin = _best(longs, index.brokers)
+    best_short, short_margin = _best(shorts, index.brokers)
+
+    header = ["Symbol"]
+    for broker in index.brokers:
+        header += [f"{broker} Long", f"{broker} Short"]
+    header += ["Better Long", "Long Δ", "Better Short", "Short Δ"]
+
+    rows = []
+    for r in np.flatnonzero(quoted):
+        row = [index.symbols[r]]
+        for col in range(len(index.brokers)):
+            row += [longs[r, col], shorts[r, col]]
+        row += [best_long[r], long_margin[r], best_short[r], short_margin[r]]
+        rows.append([None if isinstance(v, float) and np.isnan(v) else round(float(v), 4) if isinstance(v, float) else v
+                     for v in row])
+    return header, rows
@@ -0,0 +1,114 @@
+import threading
+from contextlib import contextmanager
+
+from swapcore.roundtrips import track_round_trips
+
+
+class DriverPool:
+    """Keeps Chrome sessions warm and hands them out by page-load strategy.
+
+    `factory(strategy)` must return a new WebDriver configured for that strategy
+    (e.g. spec_engine.new_chrome). A session is recycled (quit) after `max_uses`
+    checkouts or when it cannot be reset (e.g. its tab crashed); one that
+    merely failed a page is reset and reused. A session checked out before
+    close() is quit when it comes back, not kept.
+    """
+
+    def __init__(self, factory, max_uses=20, max_idle=5):
+        self.factory = factory
+        self.max_uses = max_uses
+        self.max_idle = max_idle
+        self._idle = {}  # strategy -> [(driver, uses), ...]
+        self._lock = threading.Lock()
+        self._generation = 0  # bumped by close()
+        self.launches = 0
+        self.checkouts = 0
+        self.recycled = 0
+        self.failed = 0
+
+    @contextmanager
+    def session(self, strategy='normal'):
+        driver, uses, generation = self._checkout(strategy)
+        try:
+            yield driver
+        except Exception:
+            # A page that timed out or missed a selector leaves a healthy browser, so the
+            # retry gets it back warm; _checkin discards it if the reset fails (crashed tab)
+            with self._lock:
+                self.failed += 1
+            self._checkin(strategy, driver, uses + 1, generation)
+            raise
+        except BaseException:
+            self._discard(driver)
+            raise
+        self._checkin(strategy, driver, uses + 1, generation)
+
+    def _checkout(self, strategy):
+        with self._lock:
+            self.checkouts += 1
+            generation = self._generation
+            idle = self._idle.get(strategy)
+            if idle:
+                return idle.pop() + (generation,)
+            self.launches += 1
+        return track_round_trips(self.factory(strategy)), 0, generation
+
+    def _checkin(self, strategy, driver, uses, generation):
+        # An orphaned page thread finishing after close() must not park its Chrome
+        # in the fresh idle list, where nothing would ever quit it
+        if generation != self._generation or uses >= self.max_uses or not self.reset(driver):
+            self._discard(driver)
+            return
+        with self._lock:
+            idle = self._idle.setdefault(strategy, [])
+            if generation == self._generation and len(idle) < self.max_idle:
+                idle.append((driver, uses))
+                return
+        self._discard(driver)
+
+    def _discard(self, driver):
+        with self._lock:
+            self.recycled += 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def reset(driver):
+        """Wipes cookies and stray windows so the next page starts clean."""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.delete_all_cookies()
+            try:
+                # delete_all_cookies only covers the current domain
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            except Exception:
+                pass
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    @property
+    def launches_saved(self):
+        return self.checkouts - self.launches
+
+    def report(self):
+        return (f"Driver pool: {self.checkouts} page(s), {self.launches} Chrome launch(es), "
+                f"{self.launches_saved} launch(es) saved, {self.recycled} recycled, {self.failed} failed page(s)")
+
+    def close(self):
+        with self._lock:
+            self._generation += 1
+            idle, self._idle = self._idle, {}
+        for sessions in idle.values():
+            for driver, _ in sessions:
+                try:
+                    driver.quit()
+                except Exception:
+                    pass
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+class PageTask:
+    """One blocking page scrape (`run()` returns the page's rows) for a broker.
+
+    `cancel()`, if given, is called when the page runs past `timeout` and must
+    make `run()` return soon (e.g. by quitting its browser).
+    """
+
+    def __init__(self, broker, name, url, run, timeout=120, cancel=None):
+        self.broker = broker
+        self.name = name
+        self.url = url
+        self.host = urlsplit(url).netloc
+        self.run = run
+        self.timeout = timeout
+        self.cancel = cancel
+
+    def __repr__(self):
+        return f"PageTask({self.broker}/{self.name})"
+
+
+class PageResult:
+    def __init__(self, task, rows=None, error=None, seconds=0.0):
+        self.task = task
+        self.rows = rows if rows is not None else {}
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+async def _run_page(task, host_limits, executor, on_result=None):
+    loop = asyncio.get_running_loop()
+    async with host_limits[task.host]:
+        started = time.perf_counter()
+        try:
+            # Selenium and requests block, so they run on the executor, not the loop
+            rows = await asyncio.wait_for(loop.run_in_executor(executor, task.run), task.timeout)
+            result = PageResult(task, rows, seconds=time.perf_counter() - started)
+        except asyncio.TimeoutError:
+            if task.cancel is not None:
+                # On its own thread: quitting a hung Chrome can itself take a while
+                threading.Thread(target=task.cancel, name=f"cancel-{task.name}", daemon=True).start()
+            result = PageResult(task, error=f"timed out after {task.timeout}s", seconds=time.perf_counter() - started)
+        except Exception as e:
+            result = PageResult(task, error=str(e) or type(e).__name__, seconds=time.perf_counter() - started)
+    if on_result is not None:
+        on_result(result)
+    return result
+
+
+async def run_pages(tasks, per_host=4, max_threads=None, on_result=None):
+    """Runs every task on one event loop with at most `per_host` pages per host at a time.
+
+    Results come back in the order of `tasks`, whatever order they finish in;
+    `on_result(result)` is called on the loop as each one finishes, so it must
+    not block.
+    A timed-out page is reported as failed and its task cancelled, so the
+    worker thread stops instead of running on to Selenium's own timeout;
+    queued work is dropped on cancellation.
+    """
+    host_limits = {task.host: asyncio.Semaphore(per_host) for task in tasks}
+    executor = ThreadPoolExecutor(max_workers=max_threads or max(len(tasks), 1))
+    try:
+        return await asyncio.gather(*(_run_page(task, host_limits, executor, on_result) for task in tasks))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def run_all(tasks, per_host=4, max_threads=None, on_result=None):
+    started = time.perf_counter()
+    try:
+        results = asyncio.run(run_pages(tasks, per_host, max_threads, on_result))
+    except KeyboardInterrupt:
+        print("!!! Cancelled, pending pages dropped", flush=True)
+        raise
+    for result in results:
+        status = "ok" if result.ok else f"FAILED ({result.error})"
+        print(f"{result.task.broker}/{result.task.name}: {len(result.rows)} rows in {result.seconds:.1f}s {status}", flush=True)
+    print(f"All pages finished in {time.perf_counter() - started:.1f}s", flush=True)
+    return results
@@ -0,0 +1,66 @@
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+def fixture_path(directory, url):
+    """Where a recorded copy of `url` lives: <directory>/<host>/<path>, plus .html when the path has no extension"""
+    parts = urlsplit(url)
+    path = parts.path.strip("/") or "index"
+    if not os.path.splitext(path)[1]:
+        path += ".html"
+    return os.path.join(directory, parts.netloc, path)
+
+class FixtureServer:
+    """Serves recorded pages from `directory` on localhost with optional added latency.
+
+    A page recorded from https://www.xmtrading.com/jp/forex-trading is served at
+    <base_url>/www.xmtrading.com/jp/forex-trading (see `local_url`).
+    """
+
+    def __init__(self, directory, latency=0.0, port=0):
+        self.directory = os.path.abspath(directory)
+        self.latency = latency
+        server = self
+
+        class Handler(SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=server.directory, **kwargs)
+
+            def translate_path(self, path):
+                translated = super().translate_path(path)
+                if not os.path.exists(translated) and os.path.exists(translated + ".html"):
+                    return translated + ".html"
+                return translated
+
+            def end_headers(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                super().end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = None
+
+    def local_url(self, url):
+        parts = urlsplit(url)
+        return f"{self.base_url}/{parts.netloc}{parts.path}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
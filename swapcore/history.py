@@ -0,0 +1,98 @@
+import os
+import sqlite3
+from datetime import datetime
+
+from swapcore.normalize import to_float
+
+# One SQLite file per broker, rows keyed by scrape date; override with SWAP_HISTORY_DIR
+HISTORY_DIR = os.environ.get("SWAP_HISTORY_DIR", "history")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS swaps (
+    broker      TEXT NOT NULL,
+    scrape_date TEXT NOT NULL,  -- YYYY-MM-DD, the date partition
+    scraped_at  TEXT NOT NULL,  -- ISO timestamp of the run
+    symbol      TEXT NOT NULL,
+    category    TEXT,
+    long        REAL,           -- NULL when the page showed no number
+    short       REAL,
+    long_raw    TEXT,
+    short_raw   TEXT
+);
+-- (symbol, scrape_date, scraped_at) also serves lookups by symbol and date
+DROP INDEX IF EXISTS swaps_symbol_date;
+CREATE INDEX IF NOT EXISTS swaps_symbol_date_run ON swaps (symbol, scrape_date, scraped_at);
+CREATE INDEX IF NOT EXISTS swaps_date_run ON swaps (scrape_date, scraped_at);
+CREATE INDEX IF NOT EXISTS swaps_run ON swaps (scraped_at);
+"""
+
+def connect(broker, history_dir=None):
+    history_dir = history_dir or HISTORY_DIR
+    os.makedirs(history_dir, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(history_dir, f"{broker.lower()}.sqlite3"))
+    conn.executescript(SCHEMA)
+    return conn
+
+def append_rows(broker, rows, scraped_at=None, history_dir=None):
+    """Stores one run. `rows` are dicts with Symbol, Category, Long and Short."""
+    scraped_at = scraped_at or datetime.now()
+    # Typed REAL columns straight from the normalized arrays, NULL for placeholders
+    longs = to_float([r["Long"] for r in rows]).astype(object)
+    shorts = to_float([r["Short"] for r in rows]).astype(object)
+    longs[longs != longs], shorts[shorts != shorts] = None, None
+    records = [
+        (broker, scraped_at.strftime("%Y-%m-%d"), scraped_at.isoformat(timespec="seconds"),
+         r["Symbol"], r.get("Category"), l, s, str(r["Long"]), str(r["Short"]))
+        for r, l, s in zip(rows, longs, shorts)
+    ]
+    with connect(broker, history_dir) as conn:
+        conn.executemany("INSERT INTO swaps VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", records)
+    conn.close()
+    return len(records)
+
+def query(broker, symbol=None, start=None, end=None, columns="scrape_date, scraped_at, symbol, category, long, short",
+          history_dir=None):
+    """Rows for `broker` between `start` and `end` (YYYY-MM-DD, inclusive), oldest first."""
+    where, params = [], []
+    if symbol:
+        where.append("symbol = ?")
+        params.append(symbol)
+    if start:
+        where.append("scrape_date >= ?")
+        params.append(start)
+    if end:
+        where.append("scrape_date <= ?")
+        params.append(end)
+    sql = f"SELECT {columns} FROM swaps"
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY scraped_at"
+    conn = connect(broker, history_dir)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+def last_per_day(broker, start=None, end=None, history_dir=None):
+    """(scrape_date, symbol, long, short) of each symbol's last row of each day between `start` and `end`.
+
+    Per symbol rather than per run: a page that failed or was skipped in the
+    day's last run still has its values from an earlier run that day.
+    """
+    where, params = [], []
+    if start:
+        where.append("scrape_date >= ?")
+        params.append(start)
+    if end:
+        where.append("scrape_date <= ?")
+        params.append(end)
+    # The inner query is answered from the swaps_symbol_date_run index alone
+    sql = ("SELECT s.scrape_date, s.symbol, s.long, s.short FROM swaps s JOIN "
+           f"(SELECT symbol, scrape_date, MAX(scraped_at) AS last FROM swaps {'WHERE ' + ' AND '.join(where) if where else ''} "
+           "GROUP BY symbol, scrape_date) m "
+           "ON s.symbol = m.symbol AND s.scrape_date = m.scrape_date AND s.scraped_at = m.last")
+    conn = connect(broker, history_dir)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
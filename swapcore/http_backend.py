@@ -0,0 +1,143 @@
+import threading
+
+import requests
+from lxml import html as lxml_html
+from requests.adapters import HTTPAdapter
+
+from swapcore.metrics import METRICS
+
+# Same browser identity the Selenium runs present, so servers return the same markup
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/124.0 Safari/537.36",
+    "Accept-Language": "ja,en-US;q=0.8,en;q=0.6",
+}
+
+_local = threading.local()
+
+def get_session():
+    """One pooled keep-alive session per thread (requests.Session is not thread-safe)."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=1)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update(HEADERS)
+        _local.session = session
+    return session
+
+def fetch_html(url, timeout=15):
+    response = get_session().get(url, timeout=timeout)
+    response.raise_for_status()
+    return response.text
+
+def _text(nodes):
+    return nodes[0].text_content().strip() if nodes else None
+
+def parse_xm_standard(page, name_attr):
+    """Same cells as the XM DataTables pages in brokers.py: td[data-xm-qa-name=...] in #DataTables_Table_0."""
+    results = {}
+    tree = lxml_html.fromstring(page)
+    for row in tree.xpath("//table[@id='DataTables_Table_0']//tr[td]"):
+        sym = _text(row.xpath("td[@data-xm-qa-name=$n]", n=name_attr))
+        l = _text(row.xpath("td[@data-xm-qa-name='swapLong']"))
+        s = _text(row.xpath("td[@data-xm-qa-name='swapShort']"))
+        if sym and l is not None and s is not None:
+            results[sym] = {"Long": l, "Short": s}
+    return results
+
+def parse_xm_crypto(page):
+    """Same cells as the XM Crypto page in brokers.py: td.tc and span[data-id$='data01'/'data02']."""
+    results = {}
+    tree = lxml_html.fromstring(page)
+    table = "//table[contains(concat(' ', normalize-space(@class), ' '), ' tableCommon03 ')]"
+    ends_with = ".//span[substring(@data-id, string-length(@data-id) - 5) = $suffix]"
+    for row in tree.xpath(f"{table}//tr[td]"):
+        sym = _text(row.xpath("td[contains(concat(' ', normalize-space(@class), ' '), ' tc ')]"))
+        if not sym or "商品/銘柄" in sym: continue
+        l = _text(row.xpath(ends_with, suffix="data01"))
+        s = _text(row.xpath(ends_with, suffix="data02"))
+        if l is not None and s is not None:
+            results[sym] = {"Long": l, "Short": s}
+    return results
+
+def parse_axiory(page):
+    """Same cells as the Axiory Forex page in brokers.py: column 0 symbol, 7 short, 8 long.
+
+    Returns nothing when the HTML only holds the first page of a paged table,
+    since the remaining pages need the browser.
+    """
+    results = {}
+    tree = lxml_html.fromstring(page)
+    pager = tree.xpath("//ul[contains(@class, 'configurable-dynamic-table-pager')]/li")
+    if max([int(t) for t in (li.text_content().strip() for li in pager) if t.isdigit()] or [1]) > 1:
+        return results
+    for row in tree.xpath("//tbody/tr"):
+        cols = row.xpath("td")
+        if len(cols) >= 9:
+            symbol = cols[0].text_content().strip()
+            if symbol:
+                results[symbol] = {"Swap Short": cols[7].text_content().strip(),
+                                   "Swap Long": cols[8].text_content().strip()}
+    return results
+
+def has_values(results):
+    """True when every row carries a swap value; JS-filled cells arrive empty in raw HTML."""
+    return bool(results) and all(any(v for v in vals.values()) for vals in results.values())
+
+def missing_expected(results, expected):
+    """The `expected` symbols without a value for every column in `results`."""
+    return [sym for sym in expected if sym not in results or not all(results[sym].values())]
+
+def scrape_page(name, url, parse, selenium_scrape, served_by, cache=None, http_first=True, expected=()):
+    """Scrapes one page as cheaply as possible and returns (rows, unchanged).
+
+    Order: a 304 for a page cached from HTML, then the plain HTTP fetch parsed
+    with `parse(html)`, then `selenium_scrape()`. The HTML is only used when it
+    holds every `expected` symbol, so a server render of the first DataTables
+    page (or any partial table) goes to Selenium instead. `served_by[name]` records
+    which of "cache", "http" or "selenium" produced the rows, and `unchanged`
+    is True when the table is identical to the previous run.
+    """
+    response = None
+    if http_first:
+        try:
+            headers = cache.conditional_headers(url) if cache is not None else {}
+            with METRICS.phase("http_fetch"):
+                response = get_session().get(url, headers=headers, timeout=15)
+            if response.status_code == 304 and cache.cached_rows(url) is not None:
+                served_by[name] = "cache"
+                cache.touch(url)
+                return cache.cached_rows(url), True
+            response.raise_for_status()
+        except Exception as e:
+            print(f"{name}: HTTP fetch failed ({e})", flush=True)
+            response = None
+
+    results = None
+    if http_first and response is not None:
+        try:
+            with METRICS.phase("parse"):
+                results = parse(response.text)
+        except Exception as e:
+            print(f"{name}: could not parse the HTML ({e})", flush=True)
+        if results is not None and not has_values(results):
+            print(f"{name}: no table in the HTML response, falling back to Selenium", flush=True)
+            results = None
+        missing = missing_expected(results, expected) if results is not None else []
+        if missing:
+            shown = ", ".join(missing[:5]) + (", ..." if len(missing) > 5 else "")
+            print(f"{name}: the HTML response misses {len(missing)} of {len(expected)} expected symbol(s) "
+                  f"({shown}), falling back to Selenium", flush=True)
+            results = None
+
+    if results is not None:
+        served_by[name] = "http"
+    else:
+        served_by[name] = "selenium"
+        results = selenium_scrape()
+
+    if cache is None or not results:
+        return results, False
+    return results, cache.store(url, results, served_by[name], response)
@@ -0,0 +1,145 @@
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+# JSON lines go to <SWAP_METRICS_DIR>/phases.jsonl; the Prometheus textfiles
+# (one per broker) go to SWAP_PROM_TEXTFILE_DIR, e.g. the node exporter's
+# --collector.textfile.directory
+METRICS_DIR = os.environ.get("SWAP_METRICS_DIR", "metrics")
+PROM_TEXTFILE_DIR = os.environ.get("SWAP_PROM_TEXTFILE_DIR", METRICS_DIR)
+
+
+class PhaseTimer:
+    """Collects per-page phase durations for one run.
+
+    Set the page once per thread with `page(broker, name)`; every `phase(...)`
+    inside it (including ones deep in shared helpers) is attributed to it.
+    `start_run(broker)` gives that broker's following records a new run_id, so
+    a resident daemon's cycles stay apart; until then the process-wide
+    `run_id` is used.
+    """
+
+    def __init__(self):
+        self.run_id = uuid.uuid4().hex[:12]
+        self.run_ids = {}  # broker -> run_id of its current run
+        self.records = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def start_run(self, broker):
+        with self._lock:
+            self.run_ids[broker] = uuid.uuid4().hex[:12]
+            return self.run_ids[broker]
+
+    @contextmanager
+    def page(self, broker, name):
+        previous = getattr(self._local, "page", None)
+        self._local.page = (broker, name)
+        try:
+            yield
+        finally:
+            self._local.page = previous
+
+    def current(self):
+        """(broker, page) set by page() on this thread, or None."""
+        return getattr(self._local, "page", None)
+
+    @contextmanager
+    def phase(self, name, broker=None, page=None):
+        if broker is None:
+            broker, page = getattr(self._local, "page", None) or ("unknown", "unknown")
+        started = time.perf_counter()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record(broker, page, name, time.perf_counter() - started, ok)
+
+    def record(self, broker, page, phase, seconds, ok=True):
+        with self._lock:
+            self.records.append({
+                "run_id": self.run_ids.get(broker, self.run_id), "ts": datetime.now().isoformat(timespec="milliseconds"),
+                "broker": broker, "page": page, "phase": phase, "seconds": round(seconds, 4), "ok": ok,
+            })
+
+    def take(self, broker=None):
+        """Removes and returns the records of `broker` (all brokers if None)."""
+        with self._lock:
+            taken = [r for r in self.records if broker is None or r["broker"] == broker]
+            self.records = [r for r in self.records if not (broker is None or r["broker"] == broker)]
+        return taken
+
+    def flush(self, broker=None):
+        """Appends JSON lines and rewrites the Prometheus textfile(s); returns the records written."""
+        records = self.take(broker)
+        if not records:
+            return records
+        try:
+            write_jsonl(records, os.path.join(METRICS_DIR, "phases.jsonl"))
+            for name in sorted({r["broker"] for r in records}):
+                write_prometheus([r for r in records if r["broker"] == name],
+                                 os.path.join(PROM_TEXTFILE_DIR, f"swap_scraper_{name.lower()}.prom"))
+        except Exception as e:
+            print(f"!!! Metrics Error: {str(e)}", flush=True)
+        return records
+
+
+def write_jsonl(records, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for r in records:
+            f.write(json.dumps(r, ensure_ascii=False) + "\n")
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _labels(**labels):
+    return ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+
+def write_prometheus(records, path):
+    """Textfile-collector format; written to a temp file and renamed so scrapes never see half a file."""
+    totals, counts, failures = {}, {}, {}
+    for r in records:
+        key = (r["broker"], r["page"], r["phase"])
+        totals[key] = totals.get(key, 0.0) + r["seconds"]
+        counts[key] = counts.get(key, 0) + 1
+        failures[key] = failures.get(key, 0) + (0 if r["ok"] else 1)
+
+    lines = [
+        "# HELP swap_scraper_phase_seconds Time spent in each scraper phase during the last run.",
+        "# TYPE swap_scraper_phase_seconds gauge",
+    ]
+    lines += [f"swap_scraper_phase_seconds{{{_labels(broker=b, page=p, phase=ph)}}} {totals[(b, p, ph)]:.4f}"
+              for b, p, ph in sorted(totals)]
+    lines += [
+        "# HELP swap_scraper_phase_count Times each phase ran during the last run (retries count twice).",
+        "# TYPE swap_scraper_phase_count gauge",
+    ]
+    lines += [f"swap_scraper_phase_count{{{_labels(broker=b, page=p, phase=ph)}}} {counts[(b, p, ph)]}"
+              for b, p, ph in sorted(counts)]
+    lines += [
+        "# HELP swap_scraper_phase_failures Phases that raised during the last run.",
+        "# TYPE swap_scraper_phase_failures gauge",
+    ]
+    lines += [f"swap_scraper_phase_failures{{{_labels(broker=b, page=p, phase=ph)}}} {failures[(b, p, ph)]}"
+              for b, p, ph in sorted(failures)]
+    broker = records[0]["broker"]
+    lines += [
+        "# HELP swap_scraper_last_run_timestamp_seconds Unix time the last run finished.",
+        "# TYPE swap_scraper_last_run_timestamp_seconds gauge",
+        f"swap_scraper_last_run_timestamp_seconds{{{_labels(broker=broker)}}} {time.time():.0f}",
+    ]
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(path + ".tmp", path)
+
+
+# Shared by every scraper in the process
+METRICS = PhaseTimer()
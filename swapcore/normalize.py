@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+# Full-width digits and punctuation, and every minus sign the pages use, to ASCII
+_TRANSLATE = {ord("０") + i: str(i) for i in range(10)}
+_TRANSLATE.update({ord(c): "-" for c in "−‐‑‒–—﹣－"})
+_TRANSLATE.update({ord("．"): ".", ord("，"): ",", ord("＋"): "+", ord(" "): " ", ord("　"): " "})
+
+
+def to_float(values):
+    """float64 array from swap texts; placeholders ("Web記載なし", "-", "") become NaN.
+
+    Handles full-width digits, locale minus signs, thousands separators, spaces
+    and accounting negatives "(1.23)" in one pass over the column.
+    """
+    text = pd.Series(values, dtype="object").astype(str).str.translate(_TRANSLATE)
+    text = text.str.replace(r"[,\s]", "", regex=True).str.replace(r"^\((.+)\)$", r"-\1", regex=True)
+    return pd.to_numeric(text, errors="coerce").to_numpy(dtype="float64")
+
+def normalize_frame(df, columns):
+    """Copy of `df` with `columns` as float64 plus a boolean "<column> missing" mask for each."""
+    out = df.copy()
+    for col in columns:
+        out[col] = to_float(df[col])
+        out[f"{col} missing"] = np.isnan(out[col].to_numpy())
+    return out
+
+def typed_rows(df, columns):
+    """Rows of `df` for upload: numbers where `columns` parse, the original text (placeholders) elsewhere."""
+    out = df.astype(object)
+    for col in columns:
+        numbers = to_float(df[col])
+        values = numbers.astype(object)
+        missing = np.isnan(numbers)
+        values[missing] = df[col].to_numpy(dtype=object)[missing]
+        out[col] = values
+    return out.values.tolist()
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+
+def table_hash(rows):
+    return hashlib.sha256(json.dumps(rows, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """Per-URL validators (ETag / Last-Modified), table hash and rows from the last run.
+
+    A 304 is only trusted for pages whose table was read from the HTML itself
+    (backend "http"); for JS-filled pages the document can stay the same while
+    the swaps change, so those are always scraped and compared by table hash.
+    """
+
+    def __init__(self, path=".swap_cache/pages.json"):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def conditional_headers(self, url):
+        entry = self.entries.get(url) or {}
+        if entry.get("backend") != "http":
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def cached_rows(self, url):
+        entry = self.entries.get(url)
+        return entry["rows"] if entry and entry.get("backend") == "http" else None
+
+    def store(self, url, rows, backend, response=None):
+        """Saves the page's rows and returns True if the table is identical to the last run."""
+        digest = table_hash(rows)
+        with self._lock:
+            previous = self.entries.get(url) or {}
+            self.entries[url] = {
+                "etag": response.headers.get("ETag") if response is not None else None,
+                "last_modified": response.headers.get("Last-Modified") if response is not None else None,
+                "table_hash": digest,
+                "backend": backend,
+                "rows": rows,
+                "checked_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._save()
+        return previous.get("table_hash") == digest
+
+    def touch(self, url):
+        with self._lock:
+            self.entries[url]["checked_at"] = datetime.now().isoformat(timespec="seconds")
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False)
+        os.replace(self.path + ".tmp", self.path)
@@ -0,0 +1,154 @@
+import threading
+import time
+from collections import deque
+
+from selenium.common.exceptions import TimeoutException
+
+from swapcore.metrics import METRICS
+
+# Resolves the moment `check(args)` returns something other than false/null. With
+# settleMs > 0 the returned value must also stay the same for that long (e.g. a
+# row count that stopped growing). Re-checked on every DOM mutation, not polled.
+WAIT_JS = """
+var done = arguments[arguments.length - 1];
+var args = arguments[0], timeoutMs = arguments[1], settleMs = arguments[2];
+var check = function (args) { %s };
+var started = performance.now(), last = null, settleTimer = null, finished = false;
+
+function finish(ok) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(deadline);
+    clearTimeout(settleTimer);
+    done({ok: ok, ms: performance.now() - started});
+}
+function evaluate() {
+    var value;
+    try { value = check(args); } catch (e) { value = false; }
+    if (value === false || value === null || value === undefined) {
+        last = null;
+        clearTimeout(settleTimer);
+        return;
+    }
+    if (!settleMs) return finish(true);
+    value = JSON.stringify(value);
+    if (value !== last) {
+        last = value;
+        clearTimeout(settleTimer);
+        settleTimer = setTimeout(function () { finish(true); }, settleMs);
+    }
+}
+var observer = new MutationObserver(evaluate);
+observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true, attributes: true});
+var deadline = setTimeout(function () { finish(false); }, timeoutMs);
+evaluate();
+"""
+
+# Waits not reported yet: {"broker", "label", "condition", "seconds", "ok"}, the broker
+# being the one of the METRICS page the wait ran under (bounded for the daemon)
+WAIT_LOG = deque(maxlen=500)
+_log_lock = threading.Lock()
+
+
+class Condition:
+    def __init__(self, name, check_js, args=None, settle_ms=0):
+        self.name = name
+        self.check_js = check_js
+        self.args = args or {}
+        self.settle_ms = settle_ms
+
+
+def element_present(selector):
+    return Condition(f"present {selector}", "return document.querySelector(args.selector) ? true : false;",
+                     {"selector": selector})
+
+def element_gone(selector):
+    return Condition(f"gone {selector}", """
+        var el = document.querySelector(args.selector);
+        return !el || el.offsetParent === null;
+    """, {"selector": selector})
+
+def row_count_stable(selector, quiet_ms=300, min_rows=1):
+    """At least `min_rows` rows and the count has not changed for `quiet_ms`."""
+    return Condition(f"row count stable {selector}", """
+        var n = document.querySelectorAll(args.selector).length;
+        return n >= args.minRows ? n : false;
+    """, {"selector": selector, "minRows": min_rows}, settle_ms=quiet_ms)
+
+def numeric_text_present(selector):
+    """The first element matching `selector` contains a digit."""
+    return Condition(f"numeric text in {selector}", """
+        var el = document.querySelector(args.selector);
+        return !!el && /[0-9]/.test(el.textContent);
+    """, {"selector": selector})
+
+def first_row_changed(selector, previous):
+    """textContent of the first `selector` match differs from `previous` (see first_row_text)."""
+    return Condition(f"first row changed {selector}", """
+        var el = document.querySelector(args.selector);
+        return !!el && el.textContent.trim() !== args.previous;
+    """, {"selector": selector, "previous": previous})
+
+def rows_complete(args, expected):
+    """Every `expected` symbol has a row with a non-empty long and short (args: PageSpec.js_args())."""
+    return Condition(f"{len(expected)} expected rows filled in {args['rows']}", """
+        function cell(tr, sel) {
+            var td = typeof sel === 'number' ? tr.querySelectorAll('td')[sel] : tr.querySelector(sel);
+            return td ? td.textContent.trim() : '';
+        }
+        var have = {};
+        document.querySelectorAll(args.rows).forEach(function (tr) {
+            var sym = cell(tr, args.symbol);
+            if (sym && cell(tr, args.long) && cell(tr, args.short)) have[sym] = true;
+        });
+        return args.expected.every(function (s) { return have[s]; });
+    """, dict(args, expected=list(expected)))
+
+def first_row_text(driver, selector):
+    return driver.execute_script(
+        "var el = document.querySelector(arguments[0]); return el ? el.textContent.trim() : '';", selector)
+
+
+def _log(label, condition, started, ok):
+    seconds = time.perf_counter() - started
+    broker = (METRICS.current() or (None, None))[0]
+    with _log_lock:
+        WAIT_LOG.append({"broker": broker, "label": label, "condition": condition.name, "seconds": seconds, "ok": ok})
+    return seconds
+
+def wait_for(driver, condition, timeout=20, label=""):
+    """Blocks until `condition` holds on the current page and returns the seconds it took."""
+    driver.set_script_timeout(timeout + 5)
+    started = time.perf_counter()
+    try:
+        result = driver.execute_async_script(WAIT_JS % condition.check_js, condition.args,
+                                             int(timeout * 1000), condition.settle_ms)
+        ok = bool(result and result.get("ok"))
+    except TimeoutException:
+        ok = False
+    except Exception:
+        # Crashed tab, lost session, script error: not a timeout, so let retry.classify see it
+        _log(label, condition, started, False)
+        raise
+    seconds = _log(label, condition, started, ok)
+    if not ok:
+        raise TimeoutException(f"{label}: '{condition.name}' not met within {timeout}s")
+    return seconds
+
+def take(broker=None):
+    """Removes and returns the logged waits of `broker` (all of them if None)."""
+    with _log_lock:
+        taken = [w for w in WAIT_LOG if broker is None or w["broker"] == broker]
+        kept = [w for w in WAIT_LOG if not (broker is None or w["broker"] == broker)]
+        WAIT_LOG.clear()
+        WAIT_LOG.extend(kept)
+    return taken
+
+def report(waits=None):
+    """The given waits (by default every one not reported yet, which are then dropped)."""
+    lines = ["--- Readiness waits ---"]
+    for wait in take() if waits is None else waits:
+        status = "" if wait["ok"] else "  TIMEOUT"
+        lines.append(f"{wait['label']:<20} {wait['condition']:<60} {wait['seconds']:6.2f}s{status}")
+    return "\n".join(lines)
@@ -0,0 +1,168 @@
+import json
+import os
+import random
+import threading
+import time
+
+from selenium.common.exceptions import (
+    InvalidSessionIdException, NoSuchElementException, NoSuchWindowException, StaleElementReferenceException,
+    TimeoutException, WebDriverException,
+)
+
+TIMEOUT = "timeout"
+RENDERER_CRASH = "renderer_crash"
+SELECTOR_MISS = "selector_miss"
+OTHER = "other"
+
+_CRASH_MESSAGES = ("crashed", "session deleted", "disconnected", "not reachable",
+                   "target window already closed", "invalid session id")
+
+
+class Cancelled(Exception):
+    """The page was given up on (its task timed out); never retried."""
+
+
+def classify(error):
+    """timeout, renderer_crash, selector_miss or other."""
+    if isinstance(error, Cancelled):
+        return OTHER
+    message = str(error).lower()
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)) or any(m in message for m in _CRASH_MESSAGES):
+        return RENDERER_CRASH
+    if isinstance(error, (TimeoutException, TimeoutError)) or "timed out" in message or "timeout" in message:
+        return TIMEOUT
+    if isinstance(error, (NoSuchElementException, StaleElementReferenceException)):
+        return SELECTOR_MISS
+    if isinstance(error, WebDriverException) and "no such element" in message:
+        return SELECTOR_MISS
+    return OTHER
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter: attempt n waits base * 2**(n-1), capped, times 0.5-1.5."""
+
+    def __init__(self, attempts=3, base=2.0, cap=30.0, jitter=0.5, retry_on=(TIMEOUT, RENDERER_CRASH, SELECTOR_MISS)):
+        self.attempts = attempts
+        self.base = base
+        self.cap = cap
+        self.jitter = jitter
+        self.retry_on = set(retry_on)
+
+    def delay(self, attempt):
+        return min(self.cap, self.base * 2 ** (attempt - 1)) * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+class CircuitBreaker:
+    """Per-key breaker: opens after `threshold` failed attempts in a row and then
+    refuses attempts for `cooldown` seconds, after which one trial attempt decides.
+
+    State is kept in `path` so one-shot runs from cron honour it too.
+    """
+
+    def __init__(self, threshold=3, cooldown=600, path=".swap_cache/breakers.json"):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.state = json.load(f)
+        except (OSError, ValueError):
+            self.state = {}
+
+    def allow(self, key):
+        with self._lock:
+            entry = self.state.get(key)
+            return not entry or entry.get("opened_at") is None or time.time() - entry["opened_at"] >= self.cooldown
+
+    def record(self, key, ok):
+        with self._lock:
+            if ok:
+                self.state.pop(key, None)
+            else:
+                entry = self.state.setdefault(key, {"failures": 0, "opened_at": None})
+                entry["failures"] += 1
+                if entry["failures"] >= self.threshold:
+                    # Also re-opens after a failed trial attempt
+                    entry["opened_at"] = time.time()
+            self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.state, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            pass
+
+    def opened(self):
+        with self._lock:
+            return sorted(k for k, e in self.state.items() if e.get("opened_at") is not None)
+
+
+class RetryStats:
+    def __init__(self):
+        self.attempts = 0
+        self.retries = 0
+        self.failed = 0
+        self.short_circuited = 0
+        self.seconds_lost = 0.0
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def add_error(self, kind, seconds):
+        with self._lock:
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+            self.seconds_lost += seconds
+
+    def count(self, field, n=1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + n)
+
+    def report(self):
+        kinds = ", ".join(f"{k}={n}" for k, n in sorted(self.errors.items())) or "none"
+        return (f"Retries: {self.attempts} attempt(s), {self.retries} retried, {self.failed} page(s) gave up, "
+                f"{self.short_circuited} skipped by an open breaker, {self.seconds_lost:.1f}s lost to failures [{kinds}]")
+
+
+def call(key, fn, policy, breaker, stats, label=None):
+    """Runs `fn()` under `policy` and `breaker`; returns (result, error).
+
+    Failed attempts and backoff sleeps count as time lost. `error` is the last
+    exception, or None on success. An open breaker returns (None, RuntimeError)
+    without calling `fn`.
+    """
+    label = label or key
+    if not breaker.allow(key):
+        stats.count("short_circuited")
+        print(f"!!! {label}: circuit open after repeated failures, skipped", flush=True)
+        return None, RuntimeError(f"circuit open for {key}")
+
+    error = None
+    for attempt in range(1, policy.attempts + 1):
+        stats.count("attempts")
+        started = time.perf_counter()
+        try:
+            result = fn()
+            breaker.record(key, True)
+            return result, None
+        except Exception as e:
+            error, kind = e, classify(e)
+            if not isinstance(e, Cancelled):
+                # Giving up on a slow page says nothing about whether the site is failing
+                breaker.record(key, False)
+            print(f"!!! {label}: attempt {attempt}/{policy.attempts} failed ({kind}): {str(e).splitlines()[0] if str(e) else type(e).__name__}", flush=True)
+            lost = time.perf_counter() - started
+            if attempt == policy.attempts or kind not in policy.retry_on or not breaker.allow(key):
+                stats.add_error(kind, lost)
+                break
+            wait = policy.delay(attempt)
+            stats.count("retries")
+            stats.add_error(kind, lost + wait)
+            time.sleep(wait)
+    stats.count("failed")
+    return None, error
@@ -0,0 +1,20 @@
+def track_round_trips(driver):
+    """Counts every command the driver sends to chromedriver (one HTTP round trip each).
+
+    WebElement calls go through their parent driver's `execute`, so wrapping it
+    on the instance covers find_element, get_attribute, execute_script, etc.
+    """
+    if hasattr(driver, "_round_trips"):
+        return driver
+    driver._round_trips = 0
+    execute = driver.execute
+
+    def counted_execute(*args, **kwargs):
+        driver._round_trips += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counted_execute
+    return driver
+
+def round_trips(driver):
+    return getattr(driver, "_round_trips", 0)
@@ -0,0 +1,96 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class Schedule:
+    """Every `near` minutes within `window` minutes of the daily `rollover` (HH:MM, local
+    time), every `interval` minutes otherwise."""
+
+    def __init__(self, rollover="06:00", window=60, near=10, interval=60):
+        hour, minute = (int(part) for part in rollover.split(":"))
+        self.rollover = (hour, minute)
+        self.window = timedelta(minutes=window)
+        self.near = timedelta(minutes=near)
+        self.interval = timedelta(minutes=interval)
+
+    def _rollovers(self, now):
+        today = now.replace(hour=self.rollover[0], minute=self.rollover[1], second=0, microsecond=0)
+        return [today - timedelta(days=1), today, today + timedelta(days=1)]
+
+    def near_rollover(self, now):
+        return any(abs(now - r) <= self.window for r in self._rollovers(now))
+
+    def next_run(self, now):
+        if self.near_rollover(now):
+            return now + self.near
+        # Never sleep past the start of the next rollover window
+        window_start = min(r - self.window for r in self._rollovers(now) if r - self.window > now)
+        return min(now + self.interval, window_start)
+
+    def __repr__(self):
+        return (f"Schedule(rollover={self.rollover[0]:02d}:{self.rollover[1]:02d}, window={self.window}, "
+                f"near={self.near}, interval={self.interval})")
+
+
+class Daemon:
+    """Runs each job on its own Schedule until stopped.
+
+    `jobs` maps a name to (run, schedule); `run()` does one full cycle. Each job
+    runs on its own thread, and a job that is still running when it comes due
+    again is skipped (and counted) instead of being started twice.
+    """
+
+    def __init__(self, jobs, tick=30):
+        self.jobs = jobs
+        self.tick = tick
+        self.stopping = threading.Event()
+        self.next_due = {name: datetime.now() for name in jobs}
+        self.running = {name: threading.Lock() for name in jobs}
+        self.stats = {name: {"runs": 0, "failures": 0, "skipped": 0, "last_seconds": None} for name in jobs}
+        self._threads = []
+
+    def _run(self, name, run):
+        started = time.perf_counter()
+        try:
+            run()
+        except Exception as e:
+            self.stats[name]["failures"] += 1
+            print(f"!!! {name} run failed: {e}", flush=True)
+        finally:
+            self.stats[name]["runs"] += 1
+            self.stats[name]["last_seconds"] = round(time.perf_counter() - started, 1)
+            self.running[name].release()
+            print(f"{name}: run finished in {self.stats[name]['last_seconds']}s, "
+                  f"next at {self.next_due[name]:%H:%M}", flush=True)
+
+    def poll(self, now=None):
+        """Starts every job that is due; returns the names started."""
+        now = now or datetime.now()
+        started = []
+        for name, (run, schedule) in self.jobs.items():
+            if now < self.next_due[name]:
+                continue
+            self.next_due[name] = schedule.next_run(now)
+            if not self.running[name].acquire(blocking=False):
+                self.stats[name]["skipped"] += 1
+                print(f"{name}: previous run still going, skipping this one (next at {self.next_due[name]:%H:%M})", flush=True)
+                continue
+            thread = threading.Thread(target=self._run, args=(name, run), name=f"swap-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+            started.append(name)
+        self._threads = [t for t in self._threads if t.is_alive()]
+        return started
+
+    def serve(self):
+        print("Daemon started: " + ", ".join(f"{name} {schedule}" for name, (_, schedule) in self.jobs.items()), flush=True)
+        while not self.stopping.is_set():
+            self.poll()
+            wait = min(self.next_due.values()) - datetime.now()
+            self.stopping.wait(min(max(wait.total_seconds(), 1), self.tick))
+        for thread in self._threads:
+            thread.join()
+
+    def stop(self):
+        self.stopping.set()
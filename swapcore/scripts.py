@@ -0,0 +1,13 @@
+import importlib.util
+import os
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def load_script(relative_path, module_name=None):
+    """Imports a hyphen-named script such as xm/xm-scrape.py without running its __main__ block."""
+    path = os.path.join(ROOT, relative_path)
+    name = module_name or os.path.splitext(os.path.basename(path))[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import os
+import random
+import threading
+
+import gspread
+from oauth2client.service_account import ServiceAccountCredentials
+
+SCOPE = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+
+# #333333 text, as both brokers' sheets have always used
+DARK_GREY = {"red": 0.2, "green": 0.2, "blue": 0.2}
+
+
+def _normalize(values):
+    """Makes locally built rows and rows read back from the API comparable."""
+    out = []
+    for row in values:
+        row = ["" if v is None else float(v) if isinstance(v, (int, float)) and not isinstance(v, bool) else str(v)
+               for v in row]
+        while row and row[-1] == "":
+            row.pop()
+        out.append(row)
+    while out and not out[-1]:
+        out.pop()
+    return out
+
+def _column_letter(n):
+    letters = ""
+    while n:
+        n, rem = divmod(n - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+def _changed_runs(old, new):
+    """Yields (row, first_col, [values]) for each run of adjacent changed cells."""
+    for r in range(max(len(old), len(new))):
+        old_row = old[r] if r < len(old) else []
+        new_row = new[r] if r < len(new) else []
+        run_start, run = None, []
+        for c in range(max(len(old_row), len(new_row)) + 1):
+            old_v = old_row[c] if c < len(old_row) else ""
+            new_v = new_row[c] if c < len(new_row) else ""
+            if c < max(len(old_row), len(new_row)) and old_v != new_v:
+                if run_start is None:
+                    run_start = c
+                run.append(new_v)
+            elif run_start is not None:
+                yield r, run_start, run
+                run_start, run = None, []
+
+def _cell(value):
+    if value is None or value == "":
+        return {}  # no userEnteredValue = empty cell
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"stringValue": str(value)}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+
+class SheetsWriter:
+    """Writes a whole tab (header + rows) to a spreadsheet in a single batchUpdate.
+
+    Tab creation, values, the font and the frozen header all travel in the same
+    request; the font and frozen row are only applied to tabs created by this
+    write, existing tabs keep whatever formatting they have. `api_calls` counts
+    every HTTP request made to Google since the writer was created.
+
+    The last uploaded values of each tab are kept under `snapshot_dir`. When the
+    tab still matches that snapshot only the changed cells are sent; if someone
+    edited the tab in the meantime it is rewritten in full. With `trust=True` a
+    tab this writer already checked or wrote is diffed against the snapshot
+    straight away, without the metadata and value reads (one request).
+    """
+
+    def __init__(self, keyfile, spreadsheet_name, snapshot_dir=".swap_cache/sheets"):
+        self.keyfile = keyfile
+        self.spreadsheet_name = spreadsheet_name
+        self.snapshot_dir = snapshot_dir
+        self.changed_cells = 0
+        self.api_calls = 0
+        self._client = None
+        self._spreadsheet = None
+        self._checked = {}  # title -> sheet properties, for tabs read back or written by this writer
+        self._lock = threading.Lock()
+
+    def _count_calls(self, session):
+        request = session.request
+
+        def counted_request(*args, **kwargs):
+            with self._lock:
+                self.api_calls += 1
+            return request(*args, **kwargs)
+
+        session.request = counted_request
+
+    @property
+    def spreadsheet(self):
+        if self._spreadsheet is None:
+            creds = ServiceAccountCredentials.from_json_keyfile_name(self.keyfile, SCOPE)
+            self._client = gspread.authorize(creds)
+            # gspread 6 keeps the session on http_client, gspread 5 on the client
+            self._count_calls(getattr(self._client, "http_client", self._client).session)
+            self._spreadsheet = self._client.open(self.spreadsheet_name)
+        return self._spreadsheet
+
+    def tabs(self):
+        """{title: sheet properties} for every tab, in one metadata read."""
+        metadata = self.spreadsheet.fetch_sheet_metadata(params={"fields": "sheets.properties"})
+        return {s["properties"]["title"]: s["properties"] for s in metadata.get("sheets", [])}
+
+    def _snapshot_path(self, title):
+        key = hashlib.sha1(f"{self.spreadsheet_name}\0{title}".encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.snapshot_dir, f"{key}.json")
+
+    def load_snapshot(self, title):
+        try:
+            with open(self._snapshot_path(title), encoding="utf-8") as f:
+                return json.load(f)["values"]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save_snapshot(self, title, values):
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        path = self._snapshot_path(title)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"spreadsheet": self.spreadsheet_name, "tab": title, "values": values}, f, ensure_ascii=False)
+        os.replace(path + ".tmp", path)
+
+    def read_tab(self, title, rows, cols):
+        result = self.spreadsheet.values_get(f"'{title}'!A1:{_column_letter(cols)}{rows}",
+                                             params={"valueRenderOption": "UNFORMATTED_VALUE"})
+        return result.get("values", [])
+
+    def write_tab(self, title, header, rows, text_format, min_rows=200, cols=5, trust=False):
+        """Brings tab `title` in line with header + rows (creating it if needed).
+
+        Returns "created", "rewritten", "diff" or "unchanged"; `changed_cells`
+        holds the number of cells sent.
+        """
+        values = [header] + [list(r) for r in rows]
+        wanted = _normalize(values)
+        needed_rows = max(min_rows, len(values))
+        if trust and title in self._checked:
+            snapshot = self.load_snapshot(title)
+            if snapshot is not None:
+                return self._write_diff(self._checked[title], title, _normalize(snapshot), wanted, values)
+
+        tabs = self.tabs()
+        existing = tabs.get(title)
+
+        if existing is not None:
+            snapshot = self.load_snapshot(title)
+            if snapshot is not None:
+                width = max([len(r) for r in snapshot + values] + [1])
+                height = max(len(snapshot), len(values))
+                if _normalize(self.read_tab(title, height, width)) == _normalize(snapshot):
+                    self._checked[title] = existing
+                    return self._write_diff(existing, title, _normalize(snapshot), wanted, values)
+                print(f"Tab '{title}' changed since the last upload, rewriting it in full", flush=True)
+
+        requests = []
+        if existing is None:
+            taken = {p["sheetId"] for p in tabs.values()}
+            sheet_id = random.randint(1, 2**31 - 1)
+            while sheet_id in taken:
+                sheet_id = random.randint(1, 2**31 - 1)
+            requests.append({"addSheet": {"properties": {
+                "sheetId": sheet_id, "title": title,
+                "gridProperties": {"rowCount": needed_rows, "columnCount": cols, "frozenRowCount": 1},
+            }}})
+            cell_rows = [{"values": [dict(_cell(v), userEnteredFormat={"textFormat": text_format}) for v in row]}
+                         for row in values]
+            fields = "userEnteredValue,userEnteredFormat.textFormat"
+        else:
+            sheet_id = existing["sheetId"]
+            # Clear old values (not formatting), growing the grid first if the data got longer
+            requests.append({"updateCells": {"range": {"sheetId": sheet_id}, "fields": "userEnteredValue"}})
+            requests.extend(self._grow_grid(existing, len(values)))
+            cell_rows = [{"values": [_cell(v) for v in row]} for row in values]
+            fields = "userEnteredValue"
+
+        requests.append({"updateCells": {
+            "start": {"sheetId": sheet_id, "rowIndex": 0, "columnIndex": 0},
+            "rows": cell_rows,
+            "fields": fields,
+        }})
+        self.spreadsheet.batch_update({"requests": requests})
+        self.changed_cells = sum(len(row) for row in values)
+        self.save_snapshot(title, wanted)
+        self._checked[title] = existing or {"sheetId": sheet_id, "gridProperties": {"rowCount": needed_rows}}
+        self._grown(self._checked[title], len(values))
+        return "created" if existing is None else "rewritten"
+
+    @staticmethod
+    def _grown(existing, rows):
+        grid = existing.setdefault("gridProperties", {})
+        grid["rowCount"] = max(grid.get("rowCount", 0), rows)
+
+    def _grow_grid(self, existing, rows):
+        if existing.get("gridProperties", {}).get("rowCount", 0) >= rows:
+            return []
+        return [{"updateSheetProperties": {
+            "properties": {"sheetId": existing["sheetId"], "gridProperties": {"rowCount": rows}},
+            "fields": "gridProperties.rowCount",
+        }}]
+
+    def _write_diff(self, existing, title, old, new, values):
+        sheet_id = existing["sheetId"]
+        requests = self._grow_grid(existing, len(values))
+        self.changed_cells = 0
+        for row, col, run in _changed_runs(old, new):
+            self.changed_cells += len(run)
+            requests.append({"updateCells": {
+                "start": {"sheetId": sheet_id, "rowIndex": row, "columnIndex": col},
+                "rows": [{"values": [_cell(v) for v in run]}],
+                "fields": "userEnteredValue",
+            }})
+        if not self.changed_cells:
+            return "unchanged"
+        self.spreadsheet.batch_update({"requests": requests})
+        self._grown(existing, len(values))
+        self.save_snapshot(title, new)
+        return "diff"
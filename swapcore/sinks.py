@@ -0,0 +1,350 @@
+import json
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from swapcore import history, normalize, stream
+from swapcore.metrics import METRICS
+
+
+class RunOutput:
+    """One published broker run as the sinks see it.
+
+    `df` holds the ordered rows as text (placeholders included), `frame` the
+    same rows normalized to float64 (see normalize.normalize_frame),
+    `master_map` only what was actually scraped.
+    """
+
+    def __init__(self, spec, df, frame, master_map, categories, unchanged=False, scraped_at=None):
+        self.spec = spec
+        self.df = df
+        self.frame = frame
+        self.master_map = master_map
+        self.categories = categories or {}
+        self.unchanged = unchanged
+        self.scraped_at = scraped_at or datetime.now()
+
+    def typed(self):
+        """The normalized frame with a Category column and without the missing masks."""
+        spec = self.spec
+        df = self.frame[["Symbol", spec.long_key, spec.short_key]].copy()
+        df.insert(1, "Category", [self.categories.get(sym) for sym in df["Symbol"]])
+        return df
+
+
+class Sink:
+    """Somewhere a run's output goes. write() raises on failure.
+
+    Sinks with `streams` set also get begin() when a run starts, feed(batch)
+    for each page as it finishes (stream.PageBatch) and flush() whenever no
+    more pages are queued, so pages that finish together can go out as one
+    write; write(out) still follows with the whole ordered run.
+    """
+
+    name = "sink"
+    timeout = 30
+    streams = False
+
+    def __init__(self, timeout=None):
+        if timeout is not None:
+            self.timeout = timeout
+        self.thread = None  # set by SinkRunner.start()
+
+    @property
+    def running(self):
+        """True while a SinkRunner thread (e.g. one that timed out) is still using this sink."""
+        return self.thread is not None and self.thread.is_alive()
+
+    def begin(self):
+        pass
+
+    def feed(self, batch):
+        pass
+
+    def flush(self):
+        pass
+
+    def write(self, out):
+        raise NotImplementedError
+
+
+class _FileSink(Sink):
+    extension = None
+
+    def __init__(self, directory="output", timeout=None):
+        super().__init__(timeout)
+        self.directory = directory
+
+    def path(self, out):
+        return os.path.join(self.directory, f"{out.spec.name.lower()}-{out.scraped_at:%Y-%m-%d}.{self.extension}")
+
+    def write(self, out):
+        path = self.path(out)
+        os.makedirs(self.directory, exist_ok=True)
+        # Reruns on the same day replace the file, like the day's Sheets tab
+        tmp = path + ".tmp"
+        self.dump(out, tmp)
+        os.replace(tmp, path)
+        return path
+
+    def dump(self, out, path):
+        raise NotImplementedError
+
+class CsvSink(_FileSink):
+    """The rows as shown in Sheets (its columns and header, placeholders as text), UTF-8 with BOM for Excel."""
+    name, extension = "csv", "csv"
+
+    def dump(self, out, path):
+        sheet = out.spec.sheet
+        if sheet is None:
+            out.df.to_csv(path, index=False, encoding="utf-8-sig")
+        else:
+            out.df[["Symbol"] + sheet.columns].to_csv(path, index=False, header=sheet.header, encoding="utf-8-sig")
+
+class JsonlSink(_FileSink):
+    """One JSON object per symbol; missing swaps are null.
+
+    While the run is going each page's rows are appended as they arrive (with
+    "Order", their place in the broker's order); write() then replaces the file
+    with every symbol in order.
+    """
+    name, extension = "jsonl", "jsonl"
+    streams = True
+
+    def begin(self):
+        self.file = None
+
+    def feed(self, batch):
+        spec = batch.spec
+        if self.file is None:
+            os.makedirs(self.directory, exist_ok=True)
+            self.file = open(self.path(batch), "w", encoding="utf-8")
+        scraped_at = batch.scraped_at.isoformat(timespec="seconds")
+        longs = normalize.to_float([row.values[spec.long_key] for row in batch.rows])
+        shorts = normalize.to_float([row.values[spec.short_key] for row in batch.rows])
+        for row, l, s in zip(batch.rows, longs, shorts):
+            record = {"Symbol": row.symbol, "Category": row.category, spec.long_key: None if l != l else float(l),
+                      spec.short_key: None if s != s else float(s), "Order": row.position, "scraped_at": scraped_at}
+            self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+
+    def write(self, out):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        return super().write(out)
+
+    def dump(self, out, path):
+        scraped_at = out.scraped_at.isoformat(timespec="seconds")
+        df = out.typed().astype(object)
+        df = df.where(df.notna(), None)
+        with open(path, "w", encoding="utf-8") as f:
+            for order, record in enumerate(df.to_dict("records")):
+                f.write(json.dumps({**record, "Order": order, "scraped_at": scraped_at}, ensure_ascii=False) + "\n")
+
+class ParquetSink(_FileSink):
+    """Typed float64 columns; needs pyarrow or fastparquet."""
+    name, extension = "parquet", "parquet"
+
+    def dump(self, out, path):
+        out.typed().to_parquet(path, index=False)
+
+class SqliteSink(Sink):
+    """The history store (swapcore.history) that swap-history.py and swap-analytics.py read.
+
+    Each page is stored as it finishes; write() adds whatever was not streamed.
+    """
+    name = "sqlite"
+    streams = True
+
+    def __init__(self, history_dir=None, timeout=None):
+        super().__init__(timeout)
+        self.history_dir = history_dir
+        self.stored = set()
+
+    def begin(self):
+        self.stored = set()
+
+    def _append(self, spec, rows, scraped_at):
+        # Own connection per call: sqlite3 connections stay on the thread that opened them
+        history.append_rows(spec.name, [{"Symbol": sym, "Category": category, "Long": v[spec.long_key],
+                                         "Short": v[spec.short_key]} for sym, category, v in rows],
+                            scraped_at, self.history_dir)
+        self.stored.update(sym for sym, _, _ in rows)
+
+    def feed(self, batch):
+        self._append(batch.spec, [(row.symbol, row.category, row.values) for row in batch.rows], batch.scraped_at)
+
+    def write(self, out):
+        rest = [(sym, out.categories.get(sym), v) for sym, v in out.master_map.items() if sym not in self.stored]
+        if rest:
+            self._append(out.spec, rest, out.scraped_at)
+        count = len(self.stored)
+        print(f"History: stored {count} {out.spec.name} rows in {self.history_dir or history.HISTORY_DIR}/", flush=True)
+        return count
+
+class SheetsSink(Sink):
+    """The day's tab in the broker's spreadsheet, through the run's SheetsWriter.
+
+    When streaming, changed pages are written into their rows of the tab as
+    soon as they finish (other rows keep what the last upload put there), so
+    Forex shows up while Crypto is still loading; write() then fills in the
+    placeholders. The tab is checked against its snapshot once per run, by
+    the first write; every later write of the run sends only the diff.
+    """
+    name = "sheets"
+    timeout = 120
+
+    def __init__(self, run, timeout=None, streams=True):
+        super().__init__(timeout)
+        self.run = run
+        self.streams = streams
+
+    def begin(self):
+        self.assembled = stream.OrderedRows(self.run.spec.order)
+        self.uploaded = None
+        self.pending = []
+        self.checked = False
+
+    def feed(self, batch):
+        self.assembled.add(batch.rows)
+        if not batch.unchanged:
+            self.pending.append(batch.category)
+
+    def flush(self):
+        if not self.pending:
+            return
+        categories, self.pending = self.pending, []
+        sheet, writer = self.run.spec.sheet, self.run.writer
+        title = datetime.now().strftime('%m/%d/%Y')
+        if self.uploaded is None:
+            snapshot = writer.load_snapshot(title) or []
+            self.uploaded = {row[0]: row for row in snapshot[1:] if row}
+        rows = self.assembled.rows(lambda sym: None)
+        arrived = [i for i, row in enumerate(rows) if row is not None]
+        typed = normalize.typed_rows(pd.DataFrame([{"Symbol": rows[i].symbol, **rows[i].values} for i in arrived],
+                                                  columns=["Symbol"] + sheet.columns), sheet.columns)
+        values = [self.uploaded.get(sym, [sym]) for sym in self.assembled.order] + [None] * len(self.assembled.new)
+        for i, row in zip(arrived, typed):
+            values[i] = row
+        calls = writer.api_calls
+        result = writer.write_tab(title, sheet.header, values, sheet.text_format, min_rows=sheet.min_rows,
+                                  trust=self.checked)
+        self.checked = True
+        print(f"Sheets: {', '.join(categories)} streamed to '{title}' ({result}, {writer.changed_cells} cell(s), "
+              f"{writer.api_calls - calls} API call(s))", flush=True)
+
+    def write(self, out):
+        return self.run.save_to_google_sheets(out.df, unchanged=out.unchanged, trust=self.streams and self.checked)
+
+
+SINKS = {"csv": CsvSink, "jsonl": JsonlSink, "parquet": ParquetSink, "sqlite": SqliteSink, "sheets": SheetsSink}
+
+def from_config(run):
+    """The sinks named in <ENV>_SINKS / SWAP_SINKS (default "sqlite,sheets"), each with
+    its <ENV>_SINK_TIMEOUT_<NAME> / SWAP_SINK_TIMEOUT_<NAME> if set."""
+    spec = run.spec
+    directory = spec.setting("OUTPUT_DIR", "output")
+    sinks = []
+    for name in spec.setting("SINKS", "sqlite,sheets").split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in SINKS:
+            raise ValueError(f"{spec.name}: unknown sink {name!r} (known: {', '.join(SINKS)})")
+        timeout = spec.setting(f"SINK_TIMEOUT_{name.upper()}", None)
+        timeout = float(timeout) if timeout else None
+        if name == "sheets":
+            if spec.sheet is None:
+                continue
+            sinks.append(SheetsSink(run, timeout, streams=spec.setting("SHEETS_STREAM", "1") != "0"))
+        elif name == "sqlite":
+            sinks.append(SqliteSink(timeout=timeout))
+        else:
+            sinks.append(SINKS[name](directory, timeout))
+    return sinks
+
+
+class SinkRunner:
+    """Feeds one run to every sink, each on its own daemon thread and queue.
+
+    feed() hands a finished page to the streaming sinks without waiting on
+    them; finish() sends the whole run and waits for each sink up to its
+    timeout. A sink that times out keeps running in the background, so a hung
+    Sheets call neither holds up the other sinks nor the process exit.
+    """
+
+    def __init__(self, sinks, scraped_at=None):
+        self.sinks = sinks
+        self.scraped_at = scraped_at or datetime.now()
+        self.results = {}
+        self.busy = {sink.name: 0.0 for sink in sinks}
+        self.errors = {}
+        self.queues = {sink.name: queue.Queue() for sink in sinks}
+        self.threads = []
+
+    def start(self):
+        for sink in self.sinks:
+            thread = threading.Thread(target=self._serve, args=(sink,), name=f"sink-{sink.name}", daemon=True)
+            sink.thread = thread
+            thread.start()
+            self.threads.append((sink, thread))
+        return self
+
+    def _serve(self, sink):
+        if sink.streams:
+            sink.begin()
+        while True:
+            item = self.queues[sink.name].get()
+            began = time.perf_counter()
+            if isinstance(item, stream.PageBatch):
+                try:
+                    sink.feed(item)
+                    if self.queues[sink.name].empty():
+                        sink.flush()
+                except Exception as e:
+                    # The final write() still gets its chance
+                    self.errors.setdefault(sink.name, e)
+                    print(f"!!! {sink.name}: streaming {item.category} failed: {e}", flush=True)
+                self.busy[sink.name] += time.perf_counter() - began
+                continue
+            try:
+                with METRICS.phase(f"sink_{sink.name}", item.spec.name, "Output"):
+                    detail = sink.write(item)
+                status = "ok"
+            except Exception as e:
+                status, detail = "failed", str(e).splitlines()[0] if str(e) else type(e).__name__
+            self.busy[sink.name] += time.perf_counter() - began
+            self.results[sink.name] = (status, self.busy[sink.name], detail)
+            return
+
+    def feed(self, batch):
+        for sink in self.sinks:
+            if sink.streams:
+                self.queues[sink.name].put(batch)
+
+    def finish(self, out):
+        """Sends the whole run; returns {name: (status, seconds busy, detail)}."""
+        started = time.perf_counter()
+        for sink in self.sinks:
+            self.queues[sink.name].put(out)
+        for sink, thread in self.threads:
+            thread.join(max(0.0, sink.timeout - (time.perf_counter() - started)))
+            if thread.is_alive():
+                self.results.setdefault(sink.name, ("timeout", time.perf_counter() - started,
+                                                    f"still running after {sink.timeout:g}s"))
+        return {sink.name: self.results[sink.name] for sink in self.sinks}
+
+
+def report(results):
+    parts = []
+    for name, (status, seconds, detail) in results.items():
+        part = f"{name} {status} {seconds:.2f}s"
+        if status != "ok":
+            part += f" ({detail})"
+        parts.append(part)
+    return "Sinks: " + (", ".join(parts) or "none")
@@ -0,0 +1,737 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from swapcore import blocking, capture, normalize, readiness, retry, sinks, stream
+from swapcore.driver_pool import DriverPool
+from swapcore.engine import PageTask
+from swapcore.http_backend import scrape_page
+from swapcore.metrics import METRICS
+from swapcore.page_cache import PageCache
+from swapcore.roundtrips import round_trips
+from swapcore.sheets_writer import SheetsWriter
+from swapcore.specs import DataTablesPaging, PagerPaging
+
+# ANSI Escape Sequences
+RED_BOLD = "\033[1;91m"
+RESET = "\033[0m"
+
+# Shared by the JS below: cell(tr, sel) reads a CSS selector or a td index
+_CELL_JS = """
+function cell(tr, sel) {
+    var td = typeof sel === 'number' ? tr.querySelectorAll('td')[sel] : tr.querySelector(sel);
+    return td ? td.textContent.trim() : null;
+}
+function keep(sym, l, s) {
+    if (!sym || l === null || s === null) return false;
+    return !spec.skip.some(function (t) { return sym.indexOf(t) !== -1; });
+}
+function readRows() {
+    var out = [];
+    document.querySelectorAll(spec.rows).forEach(function (tr) {
+        var sym = cell(tr, spec.symbol), l = cell(tr, spec.long), s = cell(tr, spec.short);
+        if (keep(sym, l, s)) out.push([sym, l, s]);
+    });
+    return out;
+}
+"""
+
+# Returns [[symbol, long, short], ...] for every rendered row
+EXTRACT_TABLE_JS = "var spec = arguments[0];" + _CELL_JS + "return readRows();"
+
+DATATABLES_READY_JS = """
+var $ = window.jQuery, table = arguments[0];
+return !!($ && $.fn && $.fn.dataTable && $.fn.dataTable.isDataTable(table)
+          && $(table).DataTable().rows().count() > 0);
+"""
+
+# Returns {rows: [[symbol, long, short], ...], total: n} from the DataTables data
+# source (all pages, no length menu), or null when the API is not on the page
+EXTRACT_DATATABLES_JS = "var spec = arguments[0];" + _CELL_JS + """
+var $ = window.jQuery;
+if (!$ || !$.fn || !$.fn.dataTable || !$.fn.dataTable.isDataTable(spec.table)) return null;
+var api = $(spec.table).DataTable();
+var sels = [spec.symbol, spec.long, spec.short];
+
+// Map each cell selector -> DataTables column index using a rendered row
+var colIdx = [];
+var sample = document.querySelector(spec.rows);
+sels.forEach(function (sel, k) {
+    if (!sample) return;
+    var td = typeof sel === 'number' ? sample.querySelectorAll('td')[sel] : sample.querySelector(sel);
+    if (td) { try { colIdx[k] = api.cell(td).index().column; } catch (e) {} }
+});
+function text(html) {
+    var div = document.createElement('div');
+    div.innerHTML = html == null ? '' : String(html);
+    return div.textContent.trim();
+}
+
+var out = [];
+api.rows({page: 'all', search: 'none'}).indexes().each(function (i) {
+    var node = api.row(i).node();
+    var vals = sels.map(function (sel, k) {
+        if (node) {
+            var v = cell(node, sel);
+            if (v !== null) return v;
+        }
+        // Deferred rendering: the row has no DOM node yet, render the cell instead
+        return k in colIdx ? text(api.cell(i, colIdx[k]).render('display')) : null;
+    });
+    if (keep(vals[0], vals[1], vals[2])) out.push(vals);
+});
+return {rows: out, total: api.rows().count()};
+"""
+
+# Resolves with {rows: [[symbol, long, short], ...], pages: read, total: n, error: msg|null};
+# stops early once spec.expected is complete
+COLLECT_ALL_PAGES_JS = "var spec = arguments[0];" + _CELL_JS + """
+var done = arguments[arguments.length - 1];
+var pageTimeout = arguments[1];
+
+function pagerItems() {
+    return Array.prototype.slice.call(document.querySelectorAll(spec.items));
+}
+function lastPage() {
+    // The highest number shown in the pager, so "1 2 3 ... 6" still gives 6
+    return pagerItems().reduce(function (n, li) {
+        var v = parseInt(li.textContent.trim(), 10);
+        return v > n ? v : n;
+    }, 1);
+}
+function firstRow() {
+    var tr = document.querySelector(spec.rows);
+    return tr ? tr.textContent.trim() : '';
+}
+function whenChanged(previous, callback) {
+    var finished = false;
+    function finish(ok) {
+        if (finished) return;
+        finished = true;
+        observer.disconnect();
+        clearTimeout(timer);
+        callback(ok);
+    }
+    var observer = new MutationObserver(function () {
+        if (firstRow() !== previous) finish(true);
+    });
+    observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+    var timer = setTimeout(function () { finish(false); }, pageTimeout);
+    if (firstRow() !== previous) finish(true);
+}
+
+function complete(rows) {
+    // Every expected symbol of this page already has both values
+    if (!spec.expected.length) return false;
+    var have = {};
+    rows.forEach(function (r) { if (r[1] && r[2]) have[r[0]] = true; });
+    return spec.expected.every(function (s) { return have[s]; });
+}
+
+var rows = [], page = 1, total = lastPage();
+function step() {
+    rows = rows.concat(readRows());
+    total = Math.max(total, lastPage());
+    if (page >= total || complete(rows)) return done({rows: rows, pages: page, total: total, error: null});
+
+    var target = pagerItems().filter(function (li) { return li.textContent.trim() === String(page + 1); })[0];
+    if (!target) return done({rows: rows, pages: page, error: 'no pager button for page ' + (page + 1)});
+    var previous = firstRow();
+    target.click();
+    whenChanged(previous, function (ok) {
+        if (!ok) return done({rows: rows, pages: page, error: 'page ' + (page + 1) + ' never rendered'});
+        page += 1;
+        step();
+    });
+}
+step();
+"""
+
+# Returns [highest pager number, rendered rows]
+PAGER_STATE_JS = """
+var spec = arguments[0];
+var pages = Array.prototype.reduce.call(document.querySelectorAll(spec.items), function (n, li) {
+    var v = parseInt(li.textContent.trim(), 10);
+    return v > n ? v : n;
+}, 1);
+return [pages, document.querySelectorAll(spec.rows).length];
+"""
+
+def new_chrome(strategy='normal'):
+    options = Options()
+    # options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    # Fix for 'timeout from renderer' errors
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.page_load_strategy = strategy # Flexible strategy based on URL behavior
+
+    prefs = {"profile.managed_default_content_settings.images": 2}
+    options.add_experimental_option("prefs", prefs)
+    # Network events only, for the blocked/transferred counts (blocking.NetworkStats)
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    driver = webdriver.Chrome(options=options)
+    driver.set_page_load_timeout(45) # Higher timeout for heavy Forex/Energies pages
+    return driver
+
+def launch_driver(strategy='normal'):
+    with METRICS.phase("driver_launch"):
+        return new_chrome(strategy)
+
+# Warm Chrome sessions shared by every broker in this process
+DRIVER_POOL = DriverPool(launch_driver, max_uses=int(os.environ.get("SWAP_DRIVER_MAX_USES",
+                                                                    os.environ.get("XM_DRIVER_MAX_USES", "20"))))
+
+# One breaker per page ("XM/Forex"), shared by every broker so its state file has one writer
+BREAKER = retry.CircuitBreaker(threshold=int(os.environ.get("SWAP_BREAKER_THRESHOLD", "3")),
+                               cooldown=int(os.environ.get("SWAP_BREAKER_COOLDOWN", "600")))
+
+
+def _cell(row, sel):
+    if isinstance(sel, int):
+        cols = row.find_elements(By.TAG_NAME, "td")
+        return cols[sel].get_attribute("textContent").strip() if len(cols) > sel else None
+    found = row.find_elements(By.CSS_SELECTOR, sel)
+    return found[0].get_attribute("textContent").strip() if found else None
+
+
+class BrokerRun:
+    """Scrapes, orders and publishes one BrokerSpec.
+
+    Every page goes through scrape_page (304 / HTTP parse / Selenium), Selenium
+    pages check a driver out of `pool`, and each page is timed under METRICS.
+    Settings (see BrokerSpec.setting): HTTP_FIRST, PAGE_CACHE, WORKERS,
+    DATATABLES_API, EXTRACT_MODE ("elements" or "click" use the original
+    element walk and page clicking instead of one script per table) and
+    BLOCKING (0 loads every resource; the run then records their sizes),
+    BLOCKING_CALIBRATE (0 skips the unblocked load each page gets once every
+    SWAP_RESOURCE_CALIBRATE_DAYS to size what blocking saves),
+    CAPTURE (1 reads pages that have a JsonCapture from their JSON feed; no
+    shipped page has one yet, so it does nothing until one is configured),
+    RETRY_ATTEMPTS and RETRY_BASE (seconds before the first retry, doubled
+    after each failure, with jitter) and EXPECT_TIMEOUT (seconds to wait for
+    every expected symbol of an unpaged page before its own ready condition).
+    """
+
+    def __init__(self, spec, pool=None):
+        self.spec = spec
+        self.pool = pool or DRIVER_POOL
+        self.http_first = spec.setting("HTTP_FIRST", "1") != "0"
+        self.cache = PageCache(os.environ.get(f"{spec.env}_PAGE_CACHE", f".swap_cache/{spec.name.lower()}-pages.json"))
+        self.workers = int(spec.setting("WORKERS", "5"))
+        self.datatables_api = spec.setting("DATATABLES_API", "1") != "0"
+        self.extract_mode = spec.setting("EXTRACT_MODE", "js")
+        self.blocking = spec.setting("BLOCKING", "1") != "0"
+        self.calibrate = spec.setting("BLOCKING_CALIBRATE", "1") != "0"
+        self.capture = spec.setting("CAPTURE", "0") == "1"
+        self.expect_timeout = float(spec.setting("EXPECT_TIMEOUT", "5"))
+        self.retry_policy = retry.RetryPolicy(attempts=int(spec.setting("RETRY_ATTEMPTS", "3")),
+                                              base=float(spec.setting("RETRY_BASE", "2")))
+        self.breaker = BREAKER
+        self._active = {}  # page name -> driver it is using, for cancel()
+        self._cancelled = set()
+        self.retries = retry.RetryStats()
+        self.network = blocking.NetworkStats()
+        self._network_lock = threading.Lock()
+        self.served_by = {}  # page -> "cache", "http" or "selenium"
+        self.unchanged = set()  # pages identical to the previous run
+        self._writer = None
+        self._sheets_calls = 0  # writer.api_calls when the current run started
+        self.frame = None  # normalized output of the last publish()
+        self.sinks = sinks.from_config(self)
+        self.positions = {sym: i for i, sym in enumerate(spec.order)}
+        self.sink_results = {}
+        # Output column order: the Sheets tab's (Axiory shows Short before Long)
+        self.columns = list(spec.sheet.columns) if spec.sheet else [spec.long_key, spec.short_key]
+
+    def values(self, long, short):
+        by_key = {self.spec.long_key: long, self.spec.short_key: short}
+        return {key: by_key[key] for key in self.columns}
+
+    # --- Selenium ---
+
+    def _extract(self, driver, page):
+        if self.extract_mode not in ("elements", "click"):
+            try:
+                rows = driver.execute_script(EXTRACT_TABLE_JS, page.js_args())
+                if not isinstance(rows, list):
+                    raise ValueError(f"unexpected script result: {rows!r}")
+                return rows, "js"
+            except Exception as e:
+                print(f"!!! JS extraction failed on {page.url}, falling back to elements: {e}", flush=True)
+        rows = []
+        for row in driver.find_elements(By.CSS_SELECTOR, page.rows):
+            try:
+                sym, l, s = _cell(row, page.symbol), _cell(row, page.long), _cell(row, page.short)
+                if sym and l is not None and s is not None and not any(t in sym for t in page.skip):
+                    rows.append([sym, l, s])
+            except: continue
+        return rows, "elements"
+
+    def _read_datatables(self, driver, page):
+        """Every row of the DataTables data source, or None if the API is missing."""
+        # With the 'normal' strategy scripts are loaded by now, so no plugin means no API
+        if not driver.execute_script("return !!(window.jQuery && jQuery.fn && jQuery.fn.dataTable);"):
+            return None
+        try:
+            WebDriverWait(driver, 10, poll_frequency=0.1).until(
+                lambda d: d.execute_script(DATATABLES_READY_JS, page.paging.table))
+        except TimeoutException:
+            return None
+        found = driver.execute_script(EXTRACT_DATATABLES_JS, page.js_args())
+        if not found:
+            return None
+        if len(found["rows"]) < found["total"]:
+            print(f"!!! DataTables returned {len(found['rows'])} of {found['total']} rows", flush=True)
+        return found["rows"]
+
+    def _collect_datatables(self, driver, page):
+        if self.datatables_api:
+            rows = None
+            try:
+                with METRICS.phase("extract"):
+                    rows = self._read_datatables(driver, page)
+            except Exception as e:
+                print(f"!!! DataTables API read failed on {page.url}: {e}", flush=True)
+            if rows is not None:
+                return rows, "datatables"
+            print(f"DataTables API not usable on {page.url}, using the page length menu", flush=True)
+
+        if page.paging.length_menu:
+            try:
+                with METRICS.phase("row_count_change"):
+                    driver.find_element(By.CSS_SELECTOR, page.paging.length_menu).send_keys(page.paging.length)
+                    # Redraw is done once the row count stops changing
+                    readiness.wait_for(driver, readiness.row_count_stable(page.rows, quiet_ms=300),
+                                       timeout=10, label=page.name)
+            except: pass
+        with METRICS.phase("extract"):
+            return self._extract(driver, page)
+
+    def _collect_pager_inpage(self, driver, page):
+        """Walks every pager page inside the browser and returns the whole table at once."""
+        driver.set_script_timeout(60)
+        with METRICS.phase("extract"):
+            found = driver.execute_async_script(COLLECT_ALL_PAGES_JS, page.js_args(self.spec.expected(page.name)),
+                                                page.paging.page_timeout * 1000)
+        if found["error"]:
+            raise RuntimeError(f"{found['error']} (after {found['pages']} page(s))")
+        early = f", every expected symbol found so {found['total'] - found['pages']} skipped" if found["pages"] < found["total"] else ""
+        print(f"{page.name}: read {found['pages']} pager page(s) in one script{early}", flush=True)
+        return found["rows"], "inpage"
+
+    def _collect_pager_clicks(self, driver, page):
+        rows, number = [], 1
+        while True:
+            print(f"PAGE {number}: Waiting for table data...", flush=True)
+            found, mode = self._extract(driver, page)
+            rows += found
+            if self._complete(page, rows):
+                print(f"{page.name}: every expected symbol found by page {number}, stopping", flush=True)
+                break
+            try:
+                # Page changed once the first row differs and the rows stop re-rendering
+                previous = readiness.first_row_text(driver, page.rows)
+                items = driver.find_elements(By.CSS_SELECTOR, page.paging.items)
+                target = next((li for li in items if li.text.strip() == str(number + 1)), None)
+                if target is None:
+                    break
+                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", target)
+                driver.execute_script("arguments[0].click();", target)
+                number += 1
+                label = f"{page.name} p{number}"
+                readiness.wait_for(driver, readiness.first_row_changed(page.rows, previous),
+                                   timeout=page.paging.page_timeout, label=label)
+                readiness.wait_for(driver, readiness.row_count_stable(page.rows, quiet_ms=200),
+                                   timeout=page.paging.page_timeout, label=label)
+            except Exception as e:
+                print(f"!!! Pagination Error: {str(e)}", flush=True)
+                break
+        return rows, f"{mode}, {number} page(s) clicked"
+
+    def _calibrate(self, driver, page):
+        """Loads `page` once with nothing blocked so its resources' sizes are recorded
+        (NetworkStats.read), for the blocked-bytes estimate of the blocked loads."""
+        print(f"{page.name}: unblocked calibration load for the blocked-bytes estimate", flush=True)
+        with METRICS.phase("calibrate"):
+            try:
+                blocking.apply(driver, [])
+                blocking.NetworkStats.collect(driver)
+                driver.get(page.url)
+                try:
+                    readiness.wait_for(driver, page.ready, timeout=page.timeout, label=f"{page.name} calibration")
+                except TimeoutException:
+                    pass
+                # Only the sizes are kept: this load is not part of the run's traffic
+                blocking.NetworkStats.collect(driver)
+                blocking.calibrated(page.url)
+            except Exception as e:
+                print(f"!!! Calibration load of {page.name} failed: {e}", flush=True)
+
+    def _load(self, driver, page, network, wait_ready=True):
+        if self.blocking and self.calibrate and blocking.needs_calibration(page.url):
+            self._calibrate(driver, page)
+        try:
+            blocking.apply(driver, blocking.patterns_for(page.url, page.block, page.allow) if self.blocking else [])
+        except Exception as e:
+            print(f"!!! Could not set blocked URLs for {page.name}: {e}", flush=True)
+        network.add(blocking.NetworkStats.collect(driver)) # Start the log at this page
+        with METRICS.phase("driver_get"):
+            driver.get(page.url)
+        if page.modal:
+            with METRICS.phase("handle_modal"):
+                try:
+                    WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.CSS_SELECTOR, page.modal))).click()
+                except: pass
+        if page.expand:
+            try:
+                driver.execute_script("arguments[0].click();", driver.find_element(By.CSS_SELECTOR, page.expand))
+            except: pass
+        if wait_ready:
+            self._wait_ready(driver, page)
+
+    def _complete(self, page, rows):
+        expected = self.spec.expected(page.name)
+        return bool(expected) and set(expected) <= {sym for sym, l, s in rows if l and s}
+
+    def _wait_ready(self, driver, page):
+        with METRICS.phase("table_wait"):
+            expected = self.spec.expected(page.name)
+            if expected and page.paging is None:
+                # Done the moment every expected row has both values; a delisted symbol
+                # only costs EXPECT_TIMEOUT before the page's own condition decides
+                try:
+                    readiness.wait_for(driver, readiness.rows_complete(page.js_args(), expected),
+                                       timeout=self.expect_timeout, label=page.name)
+                    return
+                except TimeoutException:
+                    pass
+            readiness.wait_for(driver, page.ready, timeout=page.timeout, label=page.name)
+
+    def _capture(self, driver, page, network):
+        """Rows from the page's own XHR/fetch JSON, or None to read the DOM instead."""
+        watcher = capture.ResponseWatcher(page.capture.url_contains)
+        deadline = time.monotonic() + page.capture.timeout
+        while time.monotonic() < deadline:
+            entries = driver.get_log("performance")
+            network.read(entries)
+            for request_id, url in watcher.feed(entries):
+                try:
+                    payload = capture.response_json(driver, request_id)
+                    rows = capture.rows_from_payload(payload, page.capture)
+                except Exception as e:
+                    print(f"{page.name}: could not read {url} ({e})", flush=True)
+                    continue
+                if rows and self._capture_complete(driver, page, rows):
+                    print(f"{page.name}: {len(rows)} rows captured from {url}", flush=True)
+                    return rows
+            time.sleep(0.1)
+        print(f"{page.name}: no usable swap JSON within {page.capture.timeout}s, reading the DOM", flush=True)
+        return None
+
+    def _capture_complete(self, driver, page, rows):
+        """False when the JSON only holds the first page of a paged table."""
+        if not isinstance(page.paging, PagerPaging):
+            return True
+        self._wait_ready(driver, page)
+        pages, shown = driver.execute_script(PAGER_STATE_JS, page.js_args())
+        if pages > 1 and len(rows) <= shown:
+            print(f"{page.name}: captured JSON holds one of {pages} pages, reading the DOM", flush=True)
+            return False
+        return True
+
+    def _read_dom(self, driver, page, network):
+        if isinstance(page.paging, DataTablesPaging):
+            return self._collect_datatables(driver, page)
+        if isinstance(page.paging, PagerPaging):
+            if self.extract_mode != "click":
+                try:
+                    return self._collect_pager_inpage(driver, page)
+                except Exception as e:
+                    print(f"!!! In-page extraction failed, falling back to clicking through pages: {str(e)}", flush=True)
+                    self._load(driver, page, network) # Start the click loop from page 1 again
+            with METRICS.phase("paginate_extract"):
+                return self._collect_pager_clicks(driver, page)
+        with METRICS.phase("extract"):
+            return self._extract(driver, page)
+
+    def scrape_selenium(self, page):
+        """Reads one page with a pooled Chrome session; returns {symbol: values}."""
+        if page.name in self._cancelled:
+            raise retry.Cancelled(f"{page.name} was given up on after its page timeout")
+        with self.pool.session(page.strategy) as driver:
+            self._active[page.name] = driver
+            try:
+                if page.name in self._cancelled:
+                    raise retry.Cancelled(f"{page.name} was given up on after its page timeout")
+                page_start = round_trips(driver)
+                network = blocking.NetworkStats()
+                capturing = page.capture is not None and self.capture
+                self._load(driver, page, network, wait_ready=not capturing)
+                extract_start = round_trips(driver)
+                rows = None
+                if capturing:
+                    with METRICS.phase("capture"):
+                        rows, mode = self._capture(driver, page, network), "capture"
+                    if rows is None:
+                        self._wait_ready(driver, page)
+                if rows is None:
+                    rows, mode = self._read_dom(driver, page, network)
+
+                results = {sym: self.values(l, s) for sym, l, s in rows}
+                print(f"{page.url}: {len(results)} rows via {mode} extraction, "
+                      f"{round_trips(driver) - extract_start} extraction / {round_trips(driver) - page_start} page WebDriver round trips", flush=True)
+                network.add(blocking.NetworkStats.collect(driver))
+                with self._network_lock:
+                    self.network.add(network)
+                print(f"{page.name}: {network.report()}", flush=True)
+            except Exception as e:
+                # cancel() quit the driver under us: no point retrying
+                if page.name in self._cancelled:
+                    raise retry.Cancelled(f"{page.name} was given up on after its page timeout") from e
+                raise
+            finally:
+                self._active.pop(page.name, None)
+        return results
+
+    def scrape_with_retry(self, page):
+        # A failed attempt hands its driver back to the pool after a reset, so the
+        # retry starts on a warm session unless the tab itself crashed
+        rows, error = retry.call(f"{self.spec.name}/{page.name}", lambda: self.scrape_selenium(page),
+                                 self.retry_policy, self.breaker, self.retries, label=page.name)
+        if error is not None:
+            print(f"!!! Error in {page.name}: {error}", flush=True)
+            return {}
+        return rows
+
+    def scrape(self, page):
+        print(f"Scraping {page.name}...", flush=True)
+        with METRICS.page(self.spec.name, page.name):
+            rows, unchanged = scrape_page(
+                page.name, page.url, page.http_parse or (lambda html: None),
+                lambda: self.scrape_with_retry(page),
+                self.served_by, self.cache, self.http_first and page.http_parse is not None,
+                expected=self.spec.expected(page.name),
+            )
+        if unchanged:
+            self.unchanged.add(page.name)
+        return rows
+
+    # --- Whole broker ---
+
+    def cancel(self, page_name):
+        """Gives up on a page that ran past its timeout: quits the Chrome session it is
+        using so the worker thread stops now instead of at Selenium's own timeout."""
+        self._cancelled.add(page_name)
+        driver = self._active.get(page_name)
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def _begin_run(self):
+        METRICS.start_run(self.spec.name)
+        self._cancelled.clear()
+        # Streamed Sheets writes happen before the final one; the run's total counts from here
+        self._sheets_calls = self._writer.api_calls if self._writer is not None else 0
+
+    def tasks(self, timeout=120):
+        self._begin_run()
+        return [PageTask(self.spec.name, page.name, page.url, lambda page=page: self.scrape(page), timeout,
+                         cancel=lambda page=page: self.cancel(page.name))
+                for page in self.spec.pages]
+
+    @property
+    def all_unchanged(self):
+        return self.unchanged.issuperset(p.name for p in self.spec.pages)
+
+    def open_sinks(self):
+        """A started SinkRunner for this run's sinks; pass it to run() and publish()."""
+        if any(sink.running for sink in self.sinks):
+            # A sink that timed out last cycle may still be writing: give this run its own
+            fresh = {sink.name: sink for sink in sinks.from_config(self)}
+            for sink in self.sinks:
+                if sink.running:
+                    print(f"{sink.name}: the previous run's write is still going, using a new sink", flush=True)
+            self.sinks = [fresh[sink.name] if sink.running else sink for sink in self.sinks]
+        return sinks.SinkRunner(self.sinks).start()
+
+    def page_done(self, runner, page_name, rows):
+        """Hands a finished page to the streaming sinks, tagged with its place in the order."""
+        if runner is not None and rows:
+            runner.feed(stream.PageBatch(self.spec, page_name, list(stream.tag(page_name, rows, self.positions)),
+                                         runner.scraped_at, unchanged=page_name in self.unchanged))
+
+    def run(self, workers=None, runner=None):
+        """Scrapes every page (`workers` at a time) and returns (rows, categories).
+
+        With a SinkRunner each page goes to the streaming sinks as soon as it is done.
+        """
+        workers = workers or self.workers
+        pages = self.spec.pages
+        self.served_by.clear()
+        self.unchanged.clear()
+        self._begin_run()
+        self.network = blocking.NetworkStats()
+        self.retries = retry.RetryStats()
+        started = time.perf_counter()
+        if workers > 1 and len(pages) > 1:
+            # At most `workers` Chrome sessions are alive at once; the rest queue up
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(self.scrape, page): i for i, page in enumerate(pages)}
+                results = [None] * len(pages)
+                for future in as_completed(futures):
+                    i = futures[future]
+                    results[i] = future.result()
+                    self.page_done(runner, pages[i].name, results[i])
+        else:
+            results = []
+            for page in pages:
+                results.append(self.scrape(page))
+                self.page_done(runner, page.name, results[-1])
+        print(f"Scraped {len(results)} page(s) with {min(max(workers, 1), len(pages))} worker(s) "
+              f"in {time.perf_counter() - started:.1f}s", flush=True)
+        return self.merge(results)
+
+    def merge(self, results):
+        """Merges per-page rows in spec order so the output never depends on timing."""
+        master_map, categories = {}, {}
+        for page, rows in zip(self.spec.pages, results):
+            master_map.update(rows)
+            categories.update(dict.fromkeys(rows, page.name))
+        names = [p.name for p in self.spec.pages]
+        print("Served by: " + ", ".join(f"{n}={self.served_by.get(n, '-')}" for n in names), flush=True)
+        print("Served from cache: " + (", ".join(n for n in names if self.served_by.get(n) == "cache") or "none"), flush=True)
+        print("Unchanged since last run: " + (", ".join(n for n in names if n in self.unchanged) or "none"), flush=True)
+        moved = [f"{sym} ({cat} -> {categories[sym]})" for cat in names for sym in self.spec.expected(cat)
+                 if sym in categories and categories[sym] != cat]
+        if moved:
+            print(f"Found on another page than config/universe.json says: {', '.join(moved)}", flush=True)
+        if self.network.requests:
+            print(f"{self.spec.name} {self.network.report()}", flush=True)
+            blocking.save_sizes()
+        if self.retries.attempts:
+            print(f"{self.spec.name} {self.retries.report()}", flush=True)
+        opened = [key for key in self.breaker.opened() if key.startswith(f"{self.spec.name}/")]
+        if opened:
+            print(f"Open circuit breakers: {', '.join(opened)}", flush=True)
+        return master_map, categories
+
+    def ordered(self, master_map):
+        """Rows in the spec's order (placeholders for missing symbols), new symbols appended."""
+        spec = self.spec
+        assembled = stream.OrderedRows(spec.order)
+        assembled.add(stream.tag(None, master_map, assembled.positions))
+        if assembled.new:
+            print(f"\n{RED_BOLD}NEW SYMBOL(S) SPOTTED!{RESET}")
+            for sym in sorted(assembled.new):
+                print(f"{RED_BOLD}-> {sym} (New item found on web, but missing from the {spec.name} order){RESET}")
+
+        missing = self.values(spec.missing, spec.missing)
+        return [{"Symbol": row.symbol, **row.values}
+                for row in assembled.rows(lambda sym: stream.Row(None, sym, None, missing))]
+
+    def publish(self, master_map, categories=None, unchanged=False, runner=None):
+        """Orders the merged rows, prints them and hands them to the configured sinks."""
+        spec = self.spec
+        final_output = self.ordered(master_map)
+        with METRICS.phase("dataframe", spec.name, "Output"):
+            df = pd.DataFrame(final_output, columns=["Symbol"] + self.columns)
+            # float64 long/short plus "<key> missing" masks, for anything that does math on the run
+            self.frame = normalize.normalize_frame(df, [spec.long_key, spec.short_key])
+        print(f"\n--- FINAL ORDERED {spec.name.upper()} DATA ---")
+        print(df.to_string(index=False), flush=True)
+        missing = int(self.frame[[f"{spec.long_key} missing", f"{spec.short_key} missing"]].any(axis=1).sum())
+        print(f"{len(df) - missing} of {len(df)} symbols with numeric swaps", flush=True)
+
+        # History, Sheets and any local files configured in <ENV>_SINKS, written side by side
+        runner = runner or self.open_sinks()
+        # The sinks share this one text frame and its float64 twin instead of rebuilding their own
+        out = sinks.RunOutput(spec, df, self.frame, master_map, categories, unchanged, runner.scraped_at)
+        self.sink_results = runner.finish(out)
+        print(sinks.report(self.sink_results), flush=True)
+        return final_output
+
+    @property
+    def writer(self):
+        if self._writer is None:
+            self._writer = SheetsWriter(self.spec.sheet.keyfile, self.spec.sheet.spreadsheet)
+        return self._writer
+
+    def save_to_google_sheets(self, df, writer=None, unchanged=False, trust=False):
+        """Uploads the ordered rows (a DataFrame with Symbol and the sheet's columns) to the day's tab.
+
+        `trust` skips the drift check when this writer already checked the tab
+        during the run (see SheetsWriter.write_tab).
+        """
+        print("\n--- Connecting to Google Sheets ---", flush=True)
+        sheet, name = self.spec.sheet, self.spec.name
+        writer = writer or self.writer
+        calls_before = writer.api_calls
+        try:
+            sheet_title = datetime.now().strftime('%m/%d/%Y')
+            if unchanged and writer.load_snapshot(sheet_title) is not None:
+                print(f"Every page matches the last upload to '{sheet_title}', skipping Sheets.", flush=True)
+                return
+            # Real numbers (sent as numberValue); placeholders stay as text
+            rows_to_upload = normalize.typed_rows(df[["Symbol"] + sheet.columns], sheet.columns)
+            with METRICS.phase("sheets_auth", name, "Sheets"):
+                writer.spreadsheet
+            # Tab creation, values, font and frozen header all go out in one batchUpdate;
+            # reruns on the same day only send the cells that changed
+            with METRICS.phase("sheets_write", name, "Sheets"):
+                result = writer.write_tab(sheet_title, sheet.header, rows_to_upload, sheet.text_format,
+                                          min_rows=sheet.min_rows, trust=trust)
+            if result == "created":
+                print(f"Created new sheet for: {sheet_title}", flush=True)
+            elif result == "unchanged":
+                print(f"Sheet for {sheet_title} already up to date, nothing sent.", flush=True)
+            else:
+                print(f"Sheet for {sheet_title} already exists. Updated {writer.changed_cells} cell(s) ({result}).", flush=True)
+            print(f"SUCCESS: Data stored in '{sheet_title}'!", flush=True)
+        except Exception as e:
+            print(f"!!! Sheets Storage Error: {str(e)}", flush=True)
+            raise
+        finally:
+            if writer is self._writer:
+                print(f"Google Sheets API calls: {writer.api_calls - self._sheets_calls} this run "
+                      f"({writer.api_calls - calls_before} in the final write)", flush=True)
+            else:
+                print(f"Google Sheets API calls: {writer.api_calls - calls_before}", flush=True)
+
+    def main(self, workers=None):
+        """One full run: scrape, publish, report and flush the phase timings."""
+        runner = self.open_sinks()
+        try:
+            master_map, categories = self.run(workers, runner)
+        finally:
+            self.pool.close()
+        self._finish(master_map, categories, runner)
+
+    def cycle(self, workers=None):
+        """Same as main() but leaves the pooled drivers (and the Sheets client) warm for the next run."""
+        runner = self.open_sinks()
+        master_map, categories = self.run(workers, runner)
+        self._finish(master_map, categories, runner)
+
+    def _finish(self, master_map, categories, runner=None):
+        print(self.pool.report(), flush=True)
+        waits = readiness.take(self.spec.name)  # this run's only: the log is shared by every broker
+        if waits:
+            print(readiness.report(waits), flush=True)
+        self.publish(master_map, categories, unchanged=self.all_unchanged, runner=runner)
+        print(f"Phase timings written for {len(METRICS.flush(self.spec.name))} phase(s)", flush=True)
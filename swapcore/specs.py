@@ -0,0 +1,135 @@
+import os
+from urllib.parse import urlsplit
+
+from swapcore import readiness, universe
+
+
+class DataTablesPaging:
+    """The table is a DataTables instance: read every row from its API, or fall back
+    to picking `length` in the page-length menu and reading the redrawn DOM."""
+
+    def __init__(self, table, length_menu=None, length="100"):
+        self.table = table
+        self.length_menu = length_menu
+        self.length = length
+
+
+class PagerPaging:
+    """The table shows one page at a time behind numbered pager `items` (li elements)."""
+
+    def __init__(self, items, page_timeout=10):
+        self.items = items
+        self.page_timeout = page_timeout
+
+
+class PageSpec:
+    """One table page of a broker.
+
+    `rows` selects the table rows; `symbol`, `long` and `short` select a cell inside
+    a row, either as a CSS selector or as the index of its td. Rows whose symbol
+    contains any of `skip` (repeated header rows) are dropped.
+
+    Before reading, the page is loaded with `strategy`, the `modal` button is
+    clicked if it shows up, `expand` is clicked if present, and `ready` (a
+    readiness.Condition, by default the first row being present) must hold.
+    `paging` is None, DataTablesPaging or PagerPaging. `http_parse(html)` reads
+    the same table from the raw HTML so Chrome can be skipped. `block` adds URL
+    patterns to the domain's blocking preset and `allow` removes patterns from it
+    (see swapcore/blocking.py). With `capture` (a capture.JsonCapture) the rows are
+    first looked for in the page's XHR/fetch JSON, with the DOM as the fallback.
+    """
+
+    def __init__(self, name, url, rows, symbol, long, short, strategy="normal", modal=None, expand=None,
+                 ready=None, paging=None, skip=(), http_parse=None, timeout=20, block=(), allow=(), capture=None):
+        self.name = name
+        self.url = url
+        self.rows = rows
+        self.symbol = symbol
+        self.long = long
+        self.short = short
+        self.strategy = strategy
+        self.modal = modal
+        self.expand = expand
+        self.ready = ready or readiness.element_present(rows)
+        self.paging = paging
+        self.skip = tuple(skip)
+        self.http_parse = http_parse
+        self.timeout = timeout
+        self.block = tuple(block)
+        self.allow = tuple(allow)
+        self.capture = capture
+
+    @property
+    def host(self):
+        return urlsplit(self.url).netloc
+
+    def at(self, url):
+        """The same page served from another URL (fixtures, mirrors)."""
+        page = PageSpec.__new__(PageSpec)
+        page.__dict__.update(self.__dict__, url=url)
+        return page
+
+    def js_args(self, expected=None):
+        args = {"rows": self.rows, "symbol": self.symbol, "long": self.long, "short": self.short,
+                "skip": list(self.skip), "expected": list(expected or [])}
+        if isinstance(self.paging, DataTablesPaging):
+            args["table"] = self.paging.table
+        if isinstance(self.paging, PagerPaging):
+            args["items"] = self.paging.items
+        return args
+
+    def __repr__(self):
+        return f"PageSpec({self.name})"
+
+
+class SheetSpec:
+    """Where a broker's ordered table goes: one tab per day in `spreadsheet`.
+
+    `columns` are the row keys written after the symbol, under `header`.
+    """
+
+    def __init__(self, keyfile, spreadsheet, header, columns, text_format, min_rows=200):
+        self.keyfile = keyfile
+        self.spreadsheet = spreadsheet
+        self.header = header
+        self.columns = columns
+        self.text_format = text_format
+        self.min_rows = min_rows
+
+
+class BrokerSpec:
+    """A broker: its pages, the output order of its symbols and where results go.
+
+    `order` and `categories` (page name -> expected symbols) default to the
+    broker's entry in config/universe.json. Scraped rows are
+    {symbol: {long_key: ..., short_key: ...}}. Settings are read from
+    `<env>_<NAME>` and then `SWAP_<NAME>` environment variables.
+    """
+
+    def __init__(self, name, pages, order=None, sheet=None, long_key="Long", short_key="Short",
+                 missing="Web記載なし", env=None, categories=None):
+        self.name = name
+        self.pages = pages
+        if order is None:
+            order, loaded = universe.load(name)
+            categories = loaded if categories is None else categories
+        self.order = order
+        self.categories = categories or {}
+        self.sheet = sheet
+        self.long_key = long_key
+        self.short_key = short_key
+        self.missing = missing
+        self.env = env or name.upper()
+
+    def setting(self, name, default):
+        return os.environ.get(f"{self.env}_{name}", os.environ.get(f"SWAP_{name}", default))
+
+    def expected(self, page_name):
+        """Symbols that must all have values before `page_name` counts as complete."""
+        return self.categories.get(page_name, [])
+
+    def page(self, name):
+        return next(p for p in self.pages if p.name == name)
+
+    def __repr__(self):
+        return f"BrokerSpec({self.name}, {len(self.pages)} page(s))"
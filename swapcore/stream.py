@@ -0,0 +1,51 @@
+from collections import namedtuple
+
+# One scraped symbol on its way to the sinks: `position` is its index in the
+# broker's order (None for a symbol the order does not know yet), `values` the
+# {long_key: ..., short_key: ...} texts as extracted
+Row = namedtuple("Row", "position symbol category values")
+
+
+class PageBatch:
+    """The rows of one finished page, handed to the sinks as soon as the page is done."""
+
+    def __init__(self, spec, category, rows, scraped_at, unchanged=False):
+        self.spec = spec
+        self.category = category
+        self.rows = rows
+        self.scraped_at = scraped_at
+        self.unchanged = unchanged
+
+
+def tag(category, rows, positions):
+    """Yields a Row for each {symbol: values} of a page, in page order."""
+    for symbol, values in rows.items():
+        yield Row(positions.get(symbol), symbol, category, values)
+
+
+class OrderedRows:
+    """Puts Rows back into the broker's order as they arrive, whatever page they came from.
+
+    rows(fill) gives one entry per ordered symbol (fill(symbol) where nothing
+    has arrived) followed by the new symbols, sorted.
+    """
+
+    def __init__(self, order):
+        self.order = list(order)
+        self.positions = {symbol: i for i, symbol in enumerate(self.order)}
+        self.slots = [None] * len(self.order)
+        self.new = {}
+
+    def add(self, rows):
+        for row in rows:
+            if row.position is None:
+                self.new[row.symbol] = row
+            else:
+                self.slots[row.position] = row
+
+    def __len__(self):
+        return sum(slot is not None for slot in self.slots) + len(self.new)
+
+    def rows(self, fill):
+        out = [slot if slot is not None else fill(symbol) for symbol, slot in zip(self.order, self.slots)]
+        return out + [self.new[symbol] for symbol in sorted(self.new)]
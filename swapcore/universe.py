@@ -0,0 +1,33 @@
+import json
+import os
+
+# Per broker: "order" (output order of every symbol), "categories" (page name ->
+# the symbols expected on that page) and optional "aliases" (broker symbol -> the
+# name other brokers use for it, e.g. XM's GOLD is XAUUSD elsewhere)
+UNIVERSE_PATH = os.environ.get(
+    "SWAP_UNIVERSE", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "universe.json"))
+
+_loaded = {}
+
+
+def _entry(broker, path):
+    if path not in _loaded:
+        with open(path, encoding="utf-8") as f:
+            _loaded[path] = json.load(f)
+    return _loaded[path][broker]
+
+def load(broker, path=None):
+    """(order, {category: [symbols]}) for `broker` from the universe file."""
+    path = path or UNIVERSE_PATH
+    entry = _entry(broker, path)
+    order = list(entry["order"])
+    categories = {cat: list(symbols) for cat, symbols in entry.get("categories", {}).items()}
+
+    stray = sorted({s for symbols in categories.values() for s in symbols} - set(order))
+    if stray:
+        raise ValueError(f"{path}: {broker} categories list symbols missing from its order: {', '.join(stray)}")
+    return order, categories
+
+def aliases(broker, path=None):
+    """{broker symbol: common name} for `broker`; empty when the file lists none."""
+    return dict(_entry(broker, path or UNIVERSE_PATH).get("aliases", {}))
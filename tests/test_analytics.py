@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from swapcore import analytics, history
+
+
+def _matrix():
+    symbols = np.array(["AAA", "BBB", "CCC"])
+    dates = np.array(["2026-10-01", "2026-10-02", "2026-10-03"])
+    long = np.array([[1.0, 1.0, 1.5], [-2.0, -2.5, np.nan], [0.5, 0.5, 0.5]])
+    short = np.array([[-3.0, -3.0, -3.0], [1.0, 1.25, 1.5], [np.nan, -0.5, -0.75]])
+    return analytics.SwapMatrix(symbols, dates, long, short)
+
+
+def test_sheet_rows_of_summary_and_ranking_side_by_side():
+    # Same layout swap-analytics.py uploads with --sheets
+    summary, ranking = analytics.summarize(_matrix(), window=2, top=5)
+    gap = pd.DataFrame({"": [None] * max(len(summary), len(ranking))})
+    combined = pd.concat([summary, gap, ranking], axis=1)
+
+    rows = analytics.sheet_rows(combined)
+
+    assert len(rows) == len(combined)
+    assert all(len(row) == combined.shape[1] for row in rows)
+    header = list(combined.columns)
+    first = dict(zip(header, rows[0]))
+    assert first["Rank"] == 1
+    assert first["Long Symbol"] == "AAA" and first["Long Carry"] == 1.5
+    assert first["Short Symbol"] == "BBB" and first["Short Carry"] == 1.5
+    assert all(row[header.index("Unusual")] in ("YES", "") for row in rows)
+    assert not any(isinstance(v, float) and v != v for row in rows for v in row)
+
+
+def test_sheet_rows_writes_infinities_as_text():
+    df = pd.DataFrame({"z": [np.inf, -np.inf, np.nan, 1.23456]})
+    assert analytics.sheet_rows(df) == [["+inf"], ["-inf"], [None], [1.2346]]
+
+
+def test_load_keeps_symbols_missing_from_the_days_last_run(tmp_path):
+    rows = [{"Symbol": sym, "Long": "1", "Short": "-2"} for sym in ("A", "B", "C")]
+    history.append_rows("XM", rows, datetime(2026, 10, 1, 9), tmp_path)
+    # The day's last run only got through the page with A
+    history.append_rows("XM", [{"Symbol": "A", "Long": "5", "Short": "-6"}], datetime(2026, 10, 1, 18), tmp_path)
+
+    matrix = analytics.SwapMatrix.load("XM", history_dir=tmp_path)
+
+    assert list(matrix.symbols) == ["A", "B", "C"]
+    assert matrix.long[:, 0].tolist() == [5.0, 1.0, 1.0]
+    assert matrix.short[:, 0].tolist() == [-6.0, -2.0, -2.0]